@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import time
+import tracemalloc
+
+# Pandoc
+import pandoc
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Time and memory (allocated by the result and at peak, with tracemalloc)
+# of transforms of large documents with pandoc.apply:
+#
+#   - noop: the transform changes nothing,
+#
+#   - one: the transform changes a single Str (in the first block),
+#
+#   - all: the transform changes every Str.
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 5
+
+
+def transforms():
+    Str = pandoc.import_types().Str
+
+    def noop(elt):
+        pass
+
+    def one(elt):
+        if type(elt) is Str and elt[0] == "0":
+            return Str("zero")
+
+    def all_(elt):
+        if type(elt) is Str:
+            return Str(elt[0].upper())
+
+    return {"noop": noop, "one": one, "all": all_}
+
+
+def traced(function, *args):
+    "Return the memory held by the result of the call and the peak (in bytes)."
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        size, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size, peak
+
+
+def elapsed(function, *args):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    print("paragraphs   transform   time (ms)   result (kB)   peak (kB)")
+    for paragraphs in PARAGRAPHS:
+        doc = document(paragraphs, distinct=True)
+        for name, transform in transforms().items():
+            duration = elapsed(pandoc.apply, transform, doc)
+            size, peak = traced(pandoc.apply, transform, doc)
+            print(
+                f"{paragraphs:>10}   {name:<9}   {duration:>9.1f}"
+                f"   {size / 1000:>11.1f}   {peak / 1000:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
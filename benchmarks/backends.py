@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import time
+
+# Pandoc
+import pandoc
+import pandoc.codec
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Throughput (nodes/s) of the JSON backends, for the reading and the writing
+# of the JSON representation of documents of various sizes.
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 5
+
+
+def throughput(function, nodes):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return nodes / min(times)
+
+
+def main():
+    types = pandoc.import_types()
+    backends = []
+    for name in pandoc.codec.BACKENDS:
+        try:
+            pandoc.configure(json_backend=name)
+        except ImportError:
+            print(f"{name}: not installed")
+        else:
+            backends.append(name)
+
+    print("backend        nodes   read (nodes/s)   write (nodes/s)")
+    for paragraphs in PARAGRAPHS:
+        doc = document(paragraphs)
+        nodes = sum(1 for elt in pandoc.iter(doc) if isinstance(elt, types.Type))
+        for name in backends:
+            pandoc.configure(json_backend=name)
+            text = pandoc.write(doc, format="json")
+            assert pandoc.read(text, format="json") == doc
+            read = throughput(lambda: pandoc.read(text, format="json"), nodes)
+            write = throughput(lambda: pandoc.write(doc, format="json"), nodes)
+            print(f"{name:<7}   {nodes:>10}   {read:>14.0f}   {write:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
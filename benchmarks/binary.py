@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import os
+import tempfile
+import time
+
+# Pandoc
+import pandoc
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Size and loading time of large documents stored as JSON (pandoc.read) and
+# in the binary format (pandoc.load), eagerly and lazily (access to the
+# metadata and to the last block only).
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 3
+
+
+def elapsed(function, *args):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def read_json(path):
+    return pandoc.read(file=path)
+
+
+def load(path):
+    return pandoc.load(path)
+
+
+def load_lazy(path):
+    doc = pandoc.load(path, lazy=True)
+    return doc[0], doc[1][-1]
+
+
+def main():
+    print("                 size (kB)                   load time (ms)")
+    print("paragraphs     json   binary       json     binary   binary (lazy)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, "doc.json")
+        binary_path = os.path.join(tmp_dir, "doc.bin")
+        for paragraphs in PARAGRAPHS:
+            doc = document(paragraphs)
+            pandoc.write(doc, file=json_path)
+            pandoc.save(doc, binary_path)
+            assert read_json(json_path) == load(binary_path) == doc
+            sizes = [os.path.getsize(p) / 1000 for p in [json_path, binary_path]]
+            times = [
+                elapsed(read_json, json_path),
+                elapsed(load, binary_path),
+                elapsed(load_lazy, binary_path),
+            ]
+            print(
+                f"{paragraphs:>10}   {sizes[0]:>6.0f}   {sizes[1]:>6.0f}"
+                f"   {times[0]:>8.2f}   {times[1]:>8.2f}   {times[2]:>13.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import collections
+import time
+
+# Pandoc
+import pandoc
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Conversion of large documents to columns (pandoc.to_columns) and back
+# (pandoc.from_columns), and two queries over all the nodes, with pandoc.iter
+# and with the columns (once converted):
+#
+#   - histogram: the number of nodes of every type,
+#
+#   - depth: the depth of the deepest node.
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 5
+
+
+def histogram_iter(doc):
+    return collections.Counter(type(elt).__name__ for elt in pandoc.iter(doc))
+
+
+def histogram_columns(columns):
+    names = columns["names"]
+    counts = collections.Counter(columns["kind"])
+    return {names[code]: count for code, count in counts.items()}
+
+
+def depth_iter(doc):
+    depth = maximum = 0
+
+    def enter(elt):
+        nonlocal depth, maximum
+        depth += 1
+        maximum = max(depth, maximum)
+
+    def exit(elt):
+        nonlocal depth
+        depth -= 1
+
+    for _ in pandoc.iter(doc, enter=enter, exit=exit):
+        pass
+    return maximum - 1
+
+
+def depth_columns(columns):
+    return max(columns["depth"])
+
+
+def elapsed(function, *args):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    print(
+        "paragraphs      nodes   to (ms)   from (ms)"
+        "   query       iter (ms)   columns (ms)"
+    )
+    for paragraphs in PARAGRAPHS:
+        doc = document(paragraphs, distinct=True)
+        columns = pandoc.to_columns(doc)
+        assert pandoc.from_columns(columns) == doc
+        to = elapsed(pandoc.to_columns, doc)
+        from_ = elapsed(pandoc.from_columns, columns)
+        queries = {
+            "histogram": (histogram_iter, histogram_columns),
+            "depth": (depth_iter, depth_columns),
+        }
+        for name, (query_iter, query_columns) in queries.items():
+            expected, result = query_iter(doc), query_columns(columns)
+            if name == "histogram":  # pandoc.iter also yields the items of dicts
+                expected["tuple"] -= 1
+            assert expected == result
+            iter_ = elapsed(query_iter, doc)
+            columns_ = elapsed(query_columns, columns)
+            print(
+                f"{paragraphs:>10}   {len(columns['kind']):>8}   {to:>7.1f}"
+                f"   {from_:>9.1f}   {name:<9}   {iter_:>9.1f}   {columns_:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
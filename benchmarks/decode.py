@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import json
+import time
+import tracemalloc
+
+# Pandoc
+import pandoc
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Decoding throughput (nodes/s) of the JSON representation of large documents:
+#
+#   - reference: json.loads then the interpreter of the type definitions
+#     that the compiled decoders have replaced (reference_read_json_v2),
+#
+#   - two-pass: json.loads then the compiled decoders (pandoc.read_json_v2),
+#
+#   - single-pass: decoding during json.loads (used by pandoc.read),
+#
+# and the peak memory used by the two last methods.
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 3
+
+
+def reference_read_json_v2(json_, type_=None):
+    types = pandoc.import_types()
+    read_json_v2 = reference_read_json_v2
+
+    if type_ is None:
+        type_ = types.Pandoc
+    if isinstance(type_, str):
+        type_ = getattr(types, type_)
+    if not isinstance(type_, list):  # not a type def (yet).
+        if issubclass(type_, types.Type):
+            type_ = type_._def
+        else:  # primitive type
+            return type_(json_)
+
+    if type_[0] == "type":  # type alias
+        type_ = type_[1][1]
+        return read_json_v2(json_, type_)
+    if type_[0] == "list":
+        item_type = type_[1][0]
+        return [read_json_v2(item, item_type) for item in json_]
+    if type_[0] == "tuple":
+        tuple_types = type_[1]
+        return tuple(
+            read_json_v2(item, item_type)
+            for (item, item_type) in zip(json_, tuple_types)
+        )
+    if type_[0] == "map":
+        key_type, value_type = type_[1]
+        return types.map(
+            [
+                (read_json_v2(k, key_type), read_json_v2(v, value_type))
+                for (k, v) in json_.items()
+            ]
+        )
+    if type_[0] == "maybe":
+        value_type = type_[1][0]
+        if json_ == None:
+            return None
+        else:
+            return read_json_v2(json_, value_type)
+
+    data_type = None
+    constructor = None
+    if type_[0] in ("data", "newtype"):
+        data_type = type_
+        constructors = data_type[1][1]
+        if len(constructors) == 1:
+            constructor = constructors[0]
+        else:
+            constructor = getattr(types, json_["t"])._def
+    elif type_[0][0] == type_[0][0].upper():
+        constructor = type_
+        constructor_type = getattr(types, constructor[0])
+        data_type = constructor_type.__mro__[2]._def
+
+    single_type_constructor = len(data_type[1][1]) == 1
+    single_constructor_argument = len(constructor[1][1]) == 1
+    is_record = constructor[1][0] == "map"
+
+    json_args = None
+    args = None
+    if constructor[0] == "Pandoc":
+        meta = read_json_v2(json_["meta"], types.Meta)
+        blocks = read_json_v2(json_["blocks"], ["list", ["Block"]])
+        return types.Pandoc(meta, blocks)
+    elif constructor[0] == "Meta":
+        type_ = ["map", ["String", "MetaValue"]]
+        return types.Meta(read_json_v2(json_, type_))
+    elif not is_record:
+        if single_type_constructor:
+            json_args = json_
+        else:
+            json_args = json_.get("c", [])
+        if single_constructor_argument:
+            json_args = [json_args]
+        args = [read_json_v2(jarg, t) for jarg, t in zip(json_args, constructor[1][1])]
+    else:
+        keys = [k for k, t in constructor[1][1]]
+        types_ = [t for k, t in constructor[1][1]]
+        json_args = [json_[k] for k in keys]
+        args = [read_json_v2(jarg, t) for jarg, t in zip(json_args, types_)]
+    C = getattr(types, constructor[0])
+    return C(*args)
+
+
+def reference(text):
+    return reference_read_json_v2(json.loads(text))
+
+
+def two_pass(text):
+    return pandoc.read_json_v2(json.loads(text))
+
+
+def single_pass(text):
+    return pandoc.codec.decoders(pandoc.import_types()).loads(text)
+
+
+def throughput(decode, text, nodes):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        decode(text)
+        times.append(time.perf_counter() - start)
+    return nodes / min(times)
+
+
+def peak_memory(decode, text):
+    tracemalloc.start()
+    decode(text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    types = pandoc.import_types()
+    print("                          throughput (nodes/s)            peak memory (MiB)")
+    print("     nodes    reference     two-pass   single-pass      two-pass   single-pass")
+    for paragraphs in PARAGRAPHS:
+        doc = document(paragraphs)
+        text = json.dumps(pandoc.write_json_v2(doc))
+        nodes = sum(1 for elt in pandoc.iter(doc) if isinstance(elt, types.Type))
+        assert reference(text) == two_pass(text) == single_pass(text) == doc
+        rates = [throughput(f, text, nodes) for f in [reference, two_pass, single_pass]]
+        peaks = [peak_memory(f, text) for f in [two_pass, single_pass]]
+        print(
+            f"{nodes:>10}   {rates[0]:>10.0f}   {rates[1]:>10.0f}   {rates[2]:>11.0f}"
+            f"   {peaks[0]:>11.1f}   {peaks[1]:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
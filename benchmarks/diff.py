@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import copy
+import difflib
+import json
+import random
+import time
+
+# Pandoc
+import pandoc
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Changes between two versions of a large document (1% of the blocks are
+# edited, inserted, deleted or moved; the documents are read from JSON, so
+# that they share no nodes):
+#
+#   - equal: comparison of the documents (==),
+#
+#   - text diff: difflib applied to the JSON representations of the blocks,
+#
+#   - diff: pandoc.diff (edit script),
+#
+#   - patch: pandoc.patch (applied to a copy of the old document).
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 5
+
+
+def change(doc, rng):
+    types = pandoc.import_types()
+    blocks = doc[1]
+    for _ in range(max(1, len(blocks) // 100)):
+        action = rng.randrange(4)
+        index = rng.randrange(len(blocks))
+        if action == 0:
+            blocks[index][0][0] = types.Str("Edited")
+        elif action == 1:
+            blocks.insert(index, types.Para([types.Str("New")]))
+        elif action == 2:
+            del blocks[index]
+        else:
+            blocks.insert(rng.randrange(len(blocks)), blocks.pop(index))
+    return doc
+
+
+def text_diff(old, new):
+    old_lines = [json.dumps(pandoc.write_json_v2(block)) for block in old[1]]
+    new_lines = [json.dumps(pandoc.write_json_v2(block)) for block in new[1]]
+    return list(difflib.SequenceMatcher(None, old_lines, new_lines).get_opcodes())
+
+
+def elapsed(function, setup):
+    times = []
+    for _ in range(RUNS):
+        args = setup()
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    print("paragraphs   operations   equal (ms)   text diff (ms)   diff (ms)", end="")
+    print("   patch (ms)")
+    for paragraphs in PARAGRAPHS:
+        old_json = pandoc.write(document(paragraphs, distinct=True), format="json")
+        new_doc = change(pandoc.read(old_json, format="json"), random.Random(0))
+        new_json = pandoc.write(new_doc, format="json")
+
+        def read():
+            old = pandoc.read(old_json, format="json")
+            return old, pandoc.read(new_json, format="json")
+
+        old, new = read()
+        script = pandoc.diff(old, new)
+        assert pandoc.patch(copy.deepcopy(old), script) == new
+
+        def read_patch():
+            old, new = read()
+            return old, pandoc.diff(old, new)
+
+        equal = elapsed(lambda old, new: old == new, read)
+        text = elapsed(text_diff, read)
+        diff = elapsed(pandoc.diff, read)
+        patch = elapsed(pandoc.patch, read_patch)
+        print(
+            f"{paragraphs:>10}   {len(script):>10}   {equal:>10.2f}   {text:>14.2f}"
+            f"   {diff:>9.2f}   {patch:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+# Pandoc
+import pandoc
+
+# ------------------------------------------------------------------------------
+# Documents shared by the benchmarks.
+# ------------------------------------------------------------------------------
+
+
+def document(paragraphs, distinct=False):
+    """
+    Return a document with `paragraphs` paragraphs made of fresh nodes (no node
+    is shared between paragraphs); with `distinct`, their texts differ too.
+    """
+    types = pandoc.import_types()
+    Str, Space, Emph, Link = types.Str, types.Space, types.Emph, types.Link
+    blocks = []
+    for index in range(paragraphs):
+        word = str(index) if distinct else "ipsum"
+        inlines = [Str("Lorem"), Space(), Emph([Str(word)]), Space()]
+        inlines += [Link(("", ["ref"], []), [Str("dolor")], ("https://x.org", ""))]
+        blocks.append(types.Para(inlines))
+    meta = types.Meta({"title": types.MetaInlines([Str("Title")])})
+    return types.Pandoc(meta, blocks)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import io
+import json
+import time
+
+# Pandoc
+import pandoc
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Encoding throughput (nodes/s) of large documents as JSON, with the compiled
+# encoders (pandoc.dump) and with json.dumps applied to the output of
+# pandoc.write_json_v2 (the objects that mirror the JSON structure).
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 3
+
+
+def reference_dumps(doc):
+    return json.dumps(pandoc.write_json_v2(doc)).encode("utf-8")
+
+
+def compiled_dumps(doc):
+    output = io.BytesIO()
+    pandoc.dump(doc, output)
+    return output.getvalue()
+
+
+def throughput(dumps, doc, nodes):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        dumps(doc)
+        times.append(time.perf_counter() - start)
+    return nodes / min(times)
+
+
+def main():
+    types = pandoc.import_types()
+    print("paragraphs        nodes   reference (nodes/s)   compiled (nodes/s)")
+    for paragraphs in PARAGRAPHS:
+        doc = document(paragraphs)
+        nodes = sum(1 for elt in pandoc.iter(doc) if isinstance(elt, types.Type))
+        reference = throughput(reference_dumps, doc, nodes)
+        compiled = throughput(compiled_dumps, doc, nodes)
+        assert reference_dumps(doc) == compiled_dumps(doc)
+        print(f"{paragraphs:>10}   {nodes:>10}   {reference:>19.0f}   {compiled:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import time
+
+# Pandoc
+import pandoc
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Structural hashing and equality of large documents (read from JSON, so that
+# the documents share no nodes):
+#
+#   - hash: hash of a document, then hash again in a cached_hashes block
+#     (where it has already been hashed),
+#
+#   - dedup: set of the blocks of a document,
+#
+#   - equal: comparison of two equal documents,
+#
+#   - differ: comparison of two documents that differ by their last block,
+#     before and after they have been hashed (in a cached_hashes block).
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 5
+
+
+def elapsed(function, *args, setup=None):
+    times = []
+    for _ in range(RUNS):
+        if setup is not None:
+            args = setup()
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    types = pandoc.import_types()
+    print("paragraphs   hash (ms)   cached (ms)   dedup (ms)   equal (ms)", end="")
+    print("   differ (ms)   hashed (ms)")
+    for paragraphs in PARAGRAPHS:
+        json_ = pandoc.write(document(paragraphs), format="json")
+
+        def read():
+            return [pandoc.read(json_, format="json")]
+
+        def read_pair():
+            doc, other = pandoc.read(json_, format="json"), read()[0]
+            other[1][-1] = types.Para([types.Str("Other")])
+            return doc, other
+
+        def read_hashed_pair():
+            doc, other = read_pair()
+            hash(doc), hash(other)
+            return doc, other
+
+        hash_ = elapsed(hash, setup=read)
+        doc = read()[0]
+        dedup = elapsed(lambda doc: set(doc[1]), setup=read)
+        equal = elapsed(lambda doc, other: doc == other, doc, read()[0])
+        differ = elapsed(lambda doc, other: doc == other, setup=read_pair)
+        with types.cached_hashes():
+            hash(doc)
+            cached = elapsed(hash, doc)
+            hashed = elapsed(lambda doc, other: doc == other, setup=read_hashed_pair)
+        print(
+            f"{paragraphs:>10}   {hash_:>9.2f}   {cached:>11.4f}   {dedup:>10.2f}"
+            f"   {equal:>10.2f}   {differ:>11.2f}   {hashed:>11.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import time
+import tracemalloc
+
+# Pandoc
+import pandoc
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Latency and peak memory of the reading of large JSON documents, followed
+# by the access to their metadata and their first block, with the default
+# (eager) decoding and with lazy decoding (pandoc.read(..., lazy=True)).
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 3
+
+
+def peek(text, lazy):
+    doc = pandoc.read(text, format="json", lazy=lazy)
+    return doc[0], doc[1][0]
+
+
+def latency(text, lazy):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        peek(text, lazy)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def peak_memory(text, lazy):
+    tracemalloc.start()
+    peek(text, lazy)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    types = pandoc.import_types()
+    print("                   latency (ms)          peak memory (MiB)")
+    print("paragraphs       eager        lazy        eager        lazy")
+    for paragraphs in PARAGRAPHS:
+        doc = document(paragraphs)
+        doc[1].insert(0, types.Header(1, ("", [], []), [types.Str("Title")]))
+        text = pandoc.write(doc, format="json")
+        assert peek(text, lazy=True) == peek(text, lazy=False)
+        times = [latency(text, lazy) for lazy in [False, True]]
+        peaks = [peak_memory(text, lazy) for lazy in [False, True]]
+        print(
+            f"{paragraphs:>10}   {times[0]:>9.2f}   {times[1]:>9.2f}"
+            f"   {peaks[0]:>10.1f}   {peaks[1]:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import time
+
+# Pandoc
+import pandoc
+import pandoc.literal
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Reading time of large documents in the Python format (their repr), with
+# eval (the former implementation of the CLI write command) and with
+# pandoc.read(..., format="python") (the Python literal parser).
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 3
+
+
+def eval_(text):
+    return eval(text, pandoc.import_types().__dict__.copy())
+
+
+def parse(text):
+    return pandoc.read(text, format="python")
+
+
+def elapsed(function, text):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function(text)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    print("paragraphs   size (kB)   eval (ms)   parser (ms)   speedup")
+    for paragraphs in PARAGRAPHS:
+        text = repr(document(paragraphs))
+        assert eval_(text) == parse(text)
+        times = [elapsed(eval_, text), elapsed(parse, text)]
+        size = len(text.encode("utf-8")) / 1000
+        print(
+            f"{paragraphs:>10}   {size:>9.0f}   {times[0]:>9.1f}"
+            f"   {times[1]:>11.1f}   {times[0] / times[1]:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import os
+import time
+
+# Pandoc
+import pandoc
+
+# ------------------------------------------------------------------------------
+# Throughput of pandoc.read_many / pandoc.write_many (markdown <-> json)
+# with respect to the number of workers, with threads and with processes.
+# ------------------------------------------------------------------------------
+
+DOCUMENTS = 200
+PARAGRAPHS = 20
+
+
+def markdown(size):
+    paragraph = "Lorem *ipsum* dolor sit amet, **consectetur** adipiscing elit."
+    return "\n\n".join(paragraph for _ in range(size))
+
+
+def throughput(function):
+    start = time.perf_counter()
+    for index, result in function():
+        if isinstance(result, Exception):
+            raise result
+    return DOCUMENTS / (time.perf_counter() - start)
+
+
+def main():
+    sources = [markdown(PARAGRAPHS) for _ in range(DOCUMENTS)]
+    docs = [pandoc.read(source) for source in sources[:1]] * DOCUMENTS
+    cores = os.cpu_count() or 1
+    counts = sorted(set([1, 2, 4, 8, 16, cores]) & set(range(1, cores + 1)))
+
+    print(f"{cores} cores, {DOCUMENTS} documents")
+    print("workers   executor   read (docs/s)   write (docs/s)")
+    for workers in counts:
+        for processes in [False, True]:
+            executor = "process" if processes else "thread"
+            options = {"workers": workers, "processes": processes}
+            read_rate = throughput(lambda: pandoc.read_many(sources, **options))
+            write_rate = throughput(lambda: pandoc.write_many(docs, **options))
+            print(
+                f"{workers:>7}   {executor:<8}   {read_rate:>13.1f}   {write_rate:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import time
+import tracemalloc
+
+# Pandoc
+import pandoc
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Memory used by large documents (measured with tracemalloc): the total size
+# of the document and the average size of its nodes (the instances of the
+# pandoc types), for documents built in Python and read from JSON.
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 5
+
+
+def nodes(doc):
+    Constructor = pandoc.import_types().Constructor
+    return sum(1 for elt in pandoc.iter(doc) if isinstance(elt, Constructor))
+
+
+def traced(function, *args):
+    "Return the result of the call and the memory it holds (in bytes)."
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def elapsed(function, *args):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    print("paragraphs   source   nodes    size (kB)   bytes/node   time (ms)")
+    for paragraphs in PARAGRAPHS:
+        json_ = pandoc.write(document(paragraphs), format="json")
+        read = lambda: pandoc.read(json_, format="json")
+        for source, build in [("python", lambda: document(paragraphs)), ("json", read)]:
+            doc, size = traced(build)
+            count = nodes(doc)
+            duration = elapsed(build)
+            print(
+                f"{paragraphs:>10}   {source:<6} {count:>7}   {size / 1000:>9.1f}"
+                f"   {size / count:>10.1f}   {duration:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import time
+
+# Pandoc
+import pandoc
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Latency of the reading of the metadata of large JSON documents,
+# with pandoc.read(...)[0], pandoc.read(..., lazy=True)[0] and
+# pandoc.read_meta(...) (that skips the blocks).
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 5
+
+
+def read(text):
+    return pandoc.read(text, format="json")[0]
+
+
+def read_lazy(text):
+    return pandoc.read(text, format="json", lazy=True)[0]
+
+
+def read_meta(text):
+    return pandoc.read_meta(text, format="json")
+
+
+def latency(function, text):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function(text)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    types = pandoc.import_types()
+    Str = types.Str
+    meta = types.Meta(
+        {
+            "title": types.MetaInlines([Str("Title")]),
+            "author": types.MetaList([types.MetaInlines([Str("Author")])]),
+            "date": types.MetaString("2020-01-01"),
+        }
+    )
+    print("paragraphs   read (ms)   lazy read (ms)   read_meta (ms)   speedup")
+    for paragraphs in PARAGRAPHS:
+        doc = types.Pandoc(meta, document(paragraphs)[1])
+        text = pandoc.write(doc, format="json")
+        assert read(text) == read_lazy(text) == read_meta(text)
+        times = [latency(f, text) for f in [read, read_lazy, read_meta]]
+        speedup = times[0] / times[2]
+        print(
+            f"{paragraphs:>10}   {times[0]:>9.2f}   {times[1]:>14.2f}"
+            f"   {times[2]:>14.3f}   {speedup:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
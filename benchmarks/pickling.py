@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import contextlib
+import pickle
+import time
+
+# Pandoc
+import pandoc
+import pandoc.pickling
+
+# Benchmarks
+from documents import document
+
+# ------------------------------------------------------------------------------
+# Time and size of the pickles of large documents:
+#
+#   - reference: the default pickling of the instances (with their slots),
+#
+#   - generic: pickle.dumps / pickle.loads (type and arguments of the nodes),
+#
+#   - bulk: pandoc.pickling.dumps / pandoc.pickling.loads.
+# ------------------------------------------------------------------------------
+
+PARAGRAPHS = [100, 1000, 10000]
+RUNS = 5
+
+
+@contextlib.contextmanager
+def default_reduce():
+    types = pandoc.import_types()
+    Constructor = types.Constructor
+    setstates = {}
+    for type_ in types._types_dict.values():
+        if isinstance(type_, type) and "__setstate__" in vars(type_):
+            setstates[type_] = type_.__setstate__
+            del type_.__setstate__
+    reduce = Constructor.__reduce__
+    del Constructor.__reduce__
+    try:
+        yield
+    finally:
+        Constructor.__reduce__ = reduce
+        for type_, setstate in setstates.items():
+            type_.__setstate__ = setstate
+
+
+def elapsed(function, *args):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def measure(dumps, loads, doc):
+    data = dumps(doc)
+    assert loads(data) == doc
+    return elapsed(dumps, doc), elapsed(loads, data), len(data) / 1000
+
+
+def main():
+    methods = ["reference", "generic", "bulk"]
+    print("                     dumps (ms)   loads (ms)   size (kB)")
+    for paragraphs in PARAGRAPHS:
+        doc = document(paragraphs)
+        with default_reduce():
+            reference = measure(pickle.dumps, pickle.loads, doc)
+        generic = measure(pickle.dumps, pickle.loads, doc)
+        bulk = measure(pandoc.pickling.dumps, pandoc.pickling.loads, doc)
+        print(f"{paragraphs} paragraphs")
+        for method, (dumps, loads, size) in zip(methods, [reference, generic, bulk]):
+            print(f"  {method:<15}   {dumps:>10.2f}   {loads:>10.2f}   {size:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
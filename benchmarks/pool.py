@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import time
+
+# Pandoc
+import pandoc
+
+# ------------------------------------------------------------------------------
+# Latency per call of pandoc.read / pandoc.write (markdown <-> json),
+# with the default spawn path and with a pool of pre-spawned pandoc workers.
+# ------------------------------------------------------------------------------
+
+SIZES = [1, 10, 100, 1000]  # number of paragraphs
+CALLS = 20
+
+
+def markdown(size):
+    paragraph = "Lorem *ipsum* dolor sit amet, **consectetur** adipiscing elit."
+    return "\n\n".join(paragraph for _ in range(size))
+
+
+def latency(function):
+    function()  # warm-up
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        function()
+    return (time.perf_counter() - start) / CALLS
+
+
+def main():
+    print("paragraphs   mode    read (ms)   write (ms)")
+    for size in SIZES:
+        text = markdown(size)
+        doc = pandoc.read(text)
+        for mode in ["spawn", "pool"]:
+            if mode == "pool":
+                pandoc.pool(size=4)
+            read_time = latency(lambda: pandoc.read(text))
+            write_time = latency(lambda: pandoc.write(doc))
+            pandoc.pool(reset=True)
+            print(
+                f"{size:>10}   {mode:<5}   {1000*read_time:>9.2f}   {1000*write_time:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
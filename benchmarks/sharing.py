@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+# Pandoc
+import pandoc
+
+# ------------------------------------------------------------------------------
+# Memory used by a corpus of documents read from JSON, without and with
+# sharing (pandoc.configure(sharing=True)), and the time needed to read it.
+#
+# The corpus is made of the markdown files given on the command line (by
+# default, the documentation of this project), converted once by pandoc.
+# ------------------------------------------------------------------------------
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FILES = sorted(glob.glob(os.path.join(ROOT, "mkdocs", "*.md")))
+FILES += [os.path.join(ROOT, "README.md")]
+RUNS = 5
+
+
+def corpus(files):
+    return [pandoc.write(pandoc.read(file=file), format="json") for file in files]
+
+
+def read_all(json_texts):
+    return [pandoc.read(json_, format="json") for json_ in json_texts]
+
+
+def traced(function, *args):
+    "Return the result of the call and the memory it holds (in bytes)."
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def elapsed(function, *args):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    files = sys.argv[1:] or FILES
+    json_texts = corpus(files)
+    size = sum(len(json_) for json_ in json_texts)
+    print(f"{len(json_texts)} documents, {size / 1000:.0f} kB of JSON")
+    print("sharing   size (kB)   time (ms)")
+    reference = None
+    for sharing in [False, True]:
+        pandoc.configure(sharing=sharing)
+        docs, size = traced(read_all, json_texts)
+        if reference is None:
+            reference = docs
+        assert docs == reference
+        del docs
+        duration = elapsed(read_all, json_texts)
+        print(f"{str(sharing):<7}   {size / 1000:>9.1f}   {duration:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+# Python 3 Standard Library
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# ------------------------------------------------------------------------------
+# Startup time of the library in new processes, when the parsed type
+# definitions have to be computed ("cold" cache) or are loaded from the
+# disk cache ("warm" cache).
+# ------------------------------------------------------------------------------
+
+RUNS = 10
+
+IMPORT = """
+import time
+start = time.perf_counter()
+import pandoc
+import pandoc.types
+print(time.perf_counter() - start)
+"""
+
+MAKE_TYPES = """
+import os, sys, tempfile, time
+import pandoc, pandoc.types, pandoc.utils
+if sys.argv[1] == "cold":
+    cache_home = tempfile.TemporaryDirectory()
+    os.environ["XDG_CACHE_HOME"] = cache_home.name
+pandoc.utils._lexer = pandoc.utils._parser = None
+start = time.perf_counter()
+pandoc.types.make_types()
+print(time.perf_counter() - start)
+"""
+
+
+def run(script, cache_home, cold):
+    env = os.environ.copy()
+    env["XDG_CACHE_HOME"] = cache_home
+    argv = [sys.executable, "-c", script, "cold" if cold else "warm"]
+    return float(subprocess.check_output(argv, env=env))
+
+
+def median_time(script, cold):
+    times = []
+    with tempfile.TemporaryDirectory() as cache_home:
+        run(script, cache_home, cold)  # fill the cache
+        for _ in range(RUNS):
+            if cold:
+                with tempfile.TemporaryDirectory() as empty_cache_home:
+                    times.append(run(script, empty_cache_home, cold))
+            else:
+                times.append(run(script, cache_home, cold))
+    return statistics.median(times)
+
+
+def main():
+    print("cache   import pandoc (ms)   make_types (ms)")
+    for cold in [True, False]:
+        import_time = median_time(IMPORT, cold)
+        make_types_time = median_time(MAKE_TYPES, cold)
+        label = "cold" if cold else "warm"
+        print(f"{label:<5}   {1000*import_time:>18.1f}   {1000*make_types_time:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,36 @@
 # coding: utf-8
 
 # Python 3 Standard Library
-import argparse
+import atexit
 import collections
+import contextlib
 import copy
-import inspect
+import functools
+import io
 import json
+import operator
 import os.path
-import shlex
 import shutil
 import sys
 import time
 import tempfile
 
-# Third-Party Libraries
-import plumbum
+# Nota: the slow imports (plumbum, argparse, concurrent.futures) are done
+# on first use, to keep `import pandoc` fast (see the budget in test.py).
 
 # Pandoc
 import pandoc.about
+from . import binary
+from . import caching
+from . import codec
+from . import columnar
+from . import delta
+from . import lazy
+from . import literal
+from . import pickling
+from . import process
+from . import shared
+from . import stream
 from . import utils
 
 # TODO
@@ -42,6 +55,15 @@ def rmtree(path):
     shutil.rmtree(path)
 
 
+@contextlib.contextmanager
+def _tmp_dir():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        yield tmp_dir
+    finally:
+        rmtree(tmp_dir)
+
+
 # Configuration
 # ------------------------------------------------------------------------------
 _configuration = None
@@ -60,6 +82,8 @@ def configure(
     path=None,
     version=None,
     pandoc_types_version=None,
+    json_backend=None,
+    sharing=None,
     read=False,
     reset=False,
 ):
@@ -70,6 +94,8 @@ def configure(
         and path is None
         and version is None
         and pandoc_types_version is None
+        and json_backend is None
+        and sharing is None
         and read is False
         and reset is False
     )
@@ -79,25 +105,39 @@ def configure(
 
     if reset is True:
         _configuration = None  # TODO: clean the types
+        caching.clear_executables()
+        codec.set_backend(None)
+        shared.enable(False)
         return
 
+    if json_backend is not None:
+        codec.set_backend(json_backend)
+        if _configuration is not None:
+            _configuration["json_backend"] = json_backend
+
+    if sharing is not None:
+        shared.enable(sharing)
+        if _configuration is not None:
+            _configuration["sharing"] = shared.enabled()
+
     read_only = (
-        read
-        and auto is None
+        auto is None
         and path is None
         and version is None
         and pandoc_types_version is None
     )
 
     if auto:
-        try:
-            pandoc = plumbum.local["pandoc"]
-            found_path = str(pandoc.executable)
-        except plumbum.CommandNotFound as error:
-            message = "cannot find the pandoc program.\n"
-            paths = [str(p) for p in error.path]
-            message += "paths:" + str(paths)
-            raise RuntimeError(message)
+        found_path = caching.get_auto_path()
+        if found_path is None:
+            found_path = shutil.which("pandoc")
+            if found_path is None:
+                message = "cannot find the pandoc program.\n"
+                paths = os.environ.get("PATH", os.defpath).split(os.pathsep)
+                message += "paths:" + str(paths)
+                raise RuntimeError(message)
+            found_path = os.path.abspath(found_path)
+            caching.set_auto_path(found_path)
         if path is None:
             path = found_path
         elif path != found_path:
@@ -105,10 +145,24 @@ def configure(
             error += "but it doesn't match path={1!r}."
             raise ValueError(error.format(found_path, path))
 
+    executable = None
     if path is not None:
         # TODO: manage invalid path
-        pandoc = plumbum.machines.LocalCommand(path, "utf-8")
-        found_version = pandoc("--version").splitlines()[0].split(" ")[1]
+        executable = caching.get_executable(path)
+        if executable is None:
+            output = process.run(path, ["--version"], b"").decode("utf-8")
+            found_version = output.splitlines()[0].split(" ")[1]
+            try:
+                executable = {
+                    "version": found_version,
+                    "pandoc_types_versions": utils.resolve(found_version),
+                }
+            except ValueError:  # unregistered version, reported below
+                pass
+            else:
+                caching.set_executable(path, executable)
+        else:
+            found_version = executable["version"]
         if version is None:
             version = found_version
         elif version != found_version:
@@ -117,7 +171,10 @@ def configure(
             raise ValueError(error.format(found_version, version))
 
     if version is not None:
-        found_pandoc_types_versions = utils.resolve(version)
+        if executable is not None and executable["version"] == version:
+            found_pandoc_types_versions = executable["pandoc_types_versions"]
+        else:
+            found_pandoc_types_versions = utils.resolve(version)
         if pandoc_types_version is None:
             if len(found_pandoc_types_versions) >= 1:
                 # pick latest (ignore the real one that may be unknown)
@@ -132,6 +189,16 @@ def configure(
             raise ValueError(error.format(version, pandoc_types_version))
 
     if not read_only:  # set the configuration, update pandoc.types
+        # Nota: the configuration is set first, otherwise the first import
+        # of the types module would configure the library automatically.
+        _configuration = {
+            "auto": auto,
+            "path": path,
+            "version": version,
+            "pandoc_types_version": pandoc_types_version,
+            "json_backend": codec.get_backend().name,
+            "sharing": shared.enabled(),
+        }
 
         try:
             from . import types
@@ -140,19 +207,110 @@ def configure(
             # and is calling configure.
             types = sys.modules["pandoc.types"]
 
-        _configuration = {
-            "auto": auto,
-            "path": path,
-            "version": version,
-            "pandoc_types_version": pandoc_types_version,
-        }
-
         types.make_types()
 
     if read:
         return copy.copy(_configuration)
 
 
+# Worker Pool
+# ------------------------------------------------------------------------------
+_pool = None
+
+
+def pool(size=None, read=False, reset=False):
+    global _pool
+
+    if size is None and read is False and reset is False:
+        error = "pool expects at least one argument."
+        raise ValueError(error)
+
+    if reset is True or size == 0:
+        if _pool is not None:
+            _pool.close()
+        _pool = None
+        return
+
+    if size is not None:
+        if _pool is not None:
+            _pool.close()
+        _pool = process.Pool(size=size)
+
+    if read:
+        if _pool is None:
+            return None
+        _pool.check()
+        return _pool.info()
+
+
+atexit.register(pool, reset=True)
+
+
+# Read Cache
+# ------------------------------------------------------------------------------
+_cache = None
+
+
+def cache(path=None, max_size=None, read=False, clear=False, reset=False):
+    global _cache
+
+    default = (
+        path is None
+        and max_size is None
+        and read is False
+        and clear is False
+        and reset is False
+    )
+    if default:
+        error = "cache expects at least one argument."
+        raise ValueError(error)
+
+    if reset is True:
+        _cache = None
+        return
+
+    if path is not None:
+        _cache = caching.Cache(path, max_size=max_size)
+    elif max_size is not None:
+        if _cache is None:
+            raise ValueError("max_size requires a cache path.")
+        _cache.max_size = max_size
+
+    if clear and _cache is not None:
+        _cache.clear()
+
+    if read:
+        if _cache is None:
+            return None
+        return _cache.info()
+
+
+def _cache_key(source, format, options):
+    # The output of pandoc only depends on its version, the input format,
+    # the options and the source.
+    if _cache is None or format == "json":
+        return None
+    return caching.key(
+        _configuration["version"], format, json.dumps(list(options)), source
+    )
+
+
+def _is_binary_format(format, filename=None):
+    binary_formats = ["doc", "epub", "ppt", "odt"]
+    pdf = filename is not None and filename.endswith(".pdf")
+    return any(tag in format for tag in binary_formats) or pdf
+
+
+def _run_pandoc(args, input):
+    path = _configuration["path"]
+    output = None
+    if _pool is not None:
+        output = _pool.run(path, args, input)
+    if output is None:
+        output = process.run(path, args, input)
+    return output
+
+
 # JSON Reader / Writer
 # ------------------------------------------------------------------------------
 
@@ -217,9 +375,8 @@ def configure(
 #       still my preferences: it should be simpler; if you need files,
 #       use a proper keyword argument).
 
-# TODO: add ".py" / Python support
-
 _readers = {
+    ".py": "python",
     ".xhtml": "html",
     ".html": "html",
     ".htm": "html",
@@ -253,7 +410,7 @@ def default_reader_name(filename):
     return _readers.get(ext)
 
 
-def read(source=None, file=None, format=None, options=None):
+def _read_prepare(source, file, format, options):
     if configure(read=True) is None:
         configure(auto=True)
     if options is None:
@@ -271,44 +428,152 @@ def read(source=None, file=None, format=None, options=None):
         if file is not None:
             raise ValueError("source or file should be defined, not both.")
 
-    tmp_dir = tempfile.mkdtemp()
     if not isinstance(source, bytes):
         source = source.encode("utf-8")
-    input_path = os.path.join(tmp_dir, "input")
-    input = open(input_path, "wb")
-    input.write(source)
-    input.close()
 
     if format is None and filename is not None:
         format = default_reader_name(filename)
     if format is None:
         format = "markdown"
-    if format != "json" and _configuration["path"] is None:
+    if format not in ("json", "python") and _configuration["path"] is None:
         error = "reading the {0!r} format requires the pandoc program"
         raise RuntimeError(error.format(format))
+    return source, format, options
 
-    if format == "json":
-        json_file = open(input_path, "r", encoding="utf-8")
+
+def _read_args(format, options, input_path=None):
+    args = ["-t", "json"] + list(options) + ["-f", format]
+    if input_path is not None:
+        args.append(input_path)
+    return args
+
+
+def _read_json(json_bytes, lazy=False):
+    backend = codec.get_backend()
+    if lazy:
+        return _read_json_lazy(json_bytes.decode("utf-8"))
+    elif utils.version_key(_configuration["pandoc_types_version"]) < [1, 17]:
+        return read_json_v1(backend.loads(json_bytes))
     else:
-        if _configuration["path"] is None:
-            error = "reading the {0!r} format requires the pandoc program"
-            raise RuntimeError(error.format(format))
-        pandoc = plumbum.machines.LocalCommand(_configuration["path"])
-        output_path = os.path.join(tmp_dir, "output.js")
-        options = (
-            ["-t", "json", "-o", output_path]
-            + list(options)
-            + ["-f", format, input_path]
-        )
-        pandoc(options)
-        json_file = open(output_path, "r", encoding="utf-8")
-    json_ = json.load(json_file)
-    json_file.close()
-    rmtree(tmp_dir)
+        return backend.read(codec.decoders(import_types()), json_bytes)
+
+
+def _read_json_lazy(json_text):
+    "Decode the metadata; the blocks are decoded on first access."
+    types = import_types()
+    if utils.version_key(_configuration["pandoc_types_version"]) < [1, 17]:
+        read_meta = functools.partial(read_json_v1, type_=types.Meta)
+
+        def read_block(span):
+            return read_json_v1(json.loads(json_text[span]), types.Block)
+
+    else:
+        decoders = codec.decoders(types)
+        read_meta = decoders.get(types.Meta)
+
+        def read_block(span):
+            return decoders.loads(json_text[span], types.Block)
+
+    names = [
+        name
+        for name, type_ in types._types_dict.items()
+        if isinstance(type_, type)
+        and issubclass(type_, types.Constructor)
+        and issubclass(type_, types.Block)
+    ]
+    meta_json, spans = lazy.split_document(json_text, names=names)
+    blocks = lazy.LazyList(spans, read_block)
+    return types.Pandoc(read_meta(meta_json), blocks)
+
+
+def _input_file(tmp_dir, source):
+    input_path = os.path.join(tmp_dir, "input")
+    input = open(input_path, "wb")
+    input.write(source)
+    input.close()
+    return input_path
+
+
+def _json_conversion(source, format, options):
+    """
+    Generator of the JSON representation of the source: when pandoc has to be
+    run, it yields its arguments, its input and whether the worker pool may
+    be used, and receives its output.
+    """
+    key = _cache_key(source, format, options)
+    if key is not None:
+        json_bytes = _cache.get(key)
+        if json_bytes is not None:
+            return json_bytes
+    if format == "json":
+        json_bytes = source
+    elif not _is_binary_format(format):
+        json_bytes = yield _read_args(format, options), source, True
+    else:  # pandoc cannot read binary formats from stdin
+        with _tmp_dir() as tmp_dir:
+            input_path = _input_file(tmp_dir, source)
+            args = _read_args(format, options, input_path)
+            json_bytes = yield args, b"", False
+    if key is not None:
+        _cache.set(key, json_bytes)
+    return json_bytes
+
+
+def _json_source(source, format, options):
+    "Return the JSON representation of the source (converted by pandoc)."
+    conversion = _json_conversion(source, format, options)
+    try:
+        args, input, pooled = next(conversion)
+        if pooled:
+            output = _run_pandoc(args, input)
+        else:
+            output = process.run(_configuration["path"], args, input)
+        conversion.send(output)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        conversion.close()
+
+
+async def _ajson_source(source, format, options, timeout):
+    "Asynchronous version of `_json_source`."
+    conversion = _json_conversion(source, format, options)
+    try:
+        args, input, _ = next(conversion)
+        path = _configuration["path"]
+        conversion.send(await process.arun(path, args, input, timeout))
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        conversion.close()
+
+
+def _read_python(source):
+    return literal.parse(source.decode("utf-8"), import_types())
+
+
+def read(source=None, file=None, format=None, options=None, lazy=False):
+    source, format, options = _read_prepare(source, file, format, options)
+    if format == "python":
+        return _read_python(source)
+    return _read_json(_json_source(source, format, options), lazy)
+
+
+def read_meta(source=None, file=None, format=None, options=None):
+    """
+    Read the metadata of a document (a `Meta` instance) only:
+    the JSON scan stops after the metadata and skips the blocks.
+    """
+    source, format, options = _read_prepare(source, file, format, options)
+    if format == "python":
+        return _read_python(source)[0]
+    json_text = _json_source(source, format, options).decode("utf-8")
+    meta_json, _ = lazy.split_document(json_text, blocks=False)
+    types = import_types()
     if utils.version_key(_configuration["pandoc_types_version"]) < [1, 17]:
-        return read_json_v1(json_)
+        return read_json_v1(meta_json, types.Meta)
     else:
-        return read_json_v2(json_)
+        return codec.decoders(types).get(types.Meta)(meta_json)
 
 
 # TODO: add ".py" / Python support
@@ -371,10 +636,7 @@ def default_writer_name(filename):
 #       extension)
 
 
-def write(doc, file=None, format=None, options=None):
-    if options is None:
-        options = []
-
+def _as_document(doc):
     types = import_types()
 
     if isinstance(doc, types.Inline):
@@ -391,8 +653,15 @@ def write(doc, file=None, format=None, options=None):
         doc = types.Pandoc(types.Meta({}), blocks)
     if not isinstance(doc, types.Pandoc):
         raise TypeError(f"{doc!r} is not a Pandoc, Block or Inline instance.")
+    return doc
+
+
+def _write_prepare(doc, file, format, options):
+    if options is None:
+        options = []
+
+    doc = _as_document(doc)
 
-    tmp_dir = tempfile.mkdtemp()
     filename = None
     if file is not None and not hasattr(file, "write"):
         filename = file
@@ -404,53 +673,226 @@ def write(doc, file=None, format=None, options=None):
         format = "markdown"  # instead of html, yep.
     if format != "json" and _configuration["path"] is None:
         error = "writing the {0!r} format requires the pandoc program"
+    return doc, file, filename, format, options
 
-    configuration = configure(read=True)
-    if utils.version_key(configuration["pandoc_types_version"]) < [1, 17]:
-        json_ = write_json_v1(doc)
-    else:
-        json_ = write_json_v2(doc)
-    json_str = json.dumps(json_)
-    input_path = os.path.join(tmp_dir, "input.js")
-    input = open(input_path, "wb")
-    input.write(json_str.encode("utf-8"))
-    input.close()
 
-    if format == "json":
-        output_path = input_path
+def _write_args(format, options, output_path=None):
+    args = ["-t", format]
+    if output_path is not None:
+        args += ["-o", output_path]
+    return args + list(options) + ["-f", "json"]
+
+
+def _output_path(tmp_dir, filename):
+    if filename is not None:
+        # preserve extensions (sometimes pandoc looks for the extension,
+        # e.g. for pdf files)
+        tmp_filename = os.path.basename(filename)
     else:
-        if filename is not None:
-            # preserve extensions (sometimes pandoc looks for the extension,
-            # e.g. for pdf files)
-            tmp_filename = os.path.basename(filename)
-        else:
-            tmp_filename = "output"
-        pandoc = plumbum.machines.LocalCommand(_configuration["path"])
-        output_path = os.path.join(tmp_dir, tmp_filename)
-        options = (
-            ["-t", format, "-o", output_path]
-            + list(options)
-            + ["-f", "json", input_path]
-        )
-        pandoc(options)
+        tmp_filename = "output"
+    return os.path.join(tmp_dir, tmp_filename)
 
-    output_bytes = open(output_path, "rb").read()
-    binary_formats = ["doc", "epub", "ppt", "odt"]
-    if any(tag in format for tag in binary_formats) or output_path.endswith(".pdf"):
+
+def _write_output(output_bytes, file, binary):
+    if binary:
         output = output_bytes
     else:  # text format
         output = output_bytes.decode("utf-8")
-    rmtree(tmp_dir)
 
     if file is not None:
         file.write(output_bytes)
     return output
 
 
+def write(doc, file=None, format=None, options=None):
+    doc, file, filename, format, options = _write_prepare(
+        doc, file, format, options
+    )
+    binary = _is_binary_format(format, filename)
+    input = functools.partial(dump, doc)  # stream the JSON to pandoc
+    if format == "json":
+        output_bytes = _dumps(doc)
+    elif not binary:
+        output_bytes = _run_pandoc(_write_args(format, options), input)
+    else:  # pandoc cannot write binary formats to stdout
+        with _tmp_dir() as tmp_dir:
+            output_path = _output_path(tmp_dir, filename)
+            args = _write_args(format, options, output_path)
+            process.run(_configuration["path"], args, input)
+            output_bytes = open(output_path, "rb").read()
+    return _write_output(output_bytes, file, binary)
+
+
+# Asynchronous Reader / Writer
+# ------------------------------------------------------------------------------
+def concurrency(size=None, read=False):
+    if size is None and read is False:
+        error = "concurrency expects at least one argument."
+        raise ValueError(error)
+    if size is not None:
+        process.set_limit(size)
+    if read:
+        return process.get_limit()
+
+
+async def aread(
+    source=None, file=None, format=None, options=None, timeout=None, lazy=False
+):
+    source, format, options = _read_prepare(source, file, format, options)
+    if format == "python":
+        return _read_python(source)
+    json_bytes = await _ajson_source(source, format, options, timeout)
+    return _read_json(json_bytes, lazy)
+
+
+async def awrite(doc, file=None, format=None, options=None, timeout=None):
+    doc, file, filename, format, options = _write_prepare(
+        doc, file, format, options
+    )
+    input_bytes = _dumps(doc)
+    path = _configuration["path"]
+    binary = _is_binary_format(format, filename)
+    if format == "json":
+        output_bytes = input_bytes
+    elif not binary:
+        args = _write_args(format, options)
+        output_bytes = await process.arun(path, args, input_bytes, timeout)
+    else:  # pandoc cannot write binary formats to stdout
+        with _tmp_dir() as tmp_dir:
+            output_path = _output_path(tmp_dir, filename)
+            args = _write_args(format, options, output_path)
+            await process.arun(path, args, input_bytes, timeout)
+            output_bytes = open(output_path, "rb").read()
+    return _write_output(output_bytes, file, binary)
+
+
+# Batch Conversion
+# ------------------------------------------------------------------------------
+def _init_worker(configuration):
+    global _pool
+    _pool = None  # the pool workers belong to the parent process
+    if configure(read=True) != configuration:
+        configure(**configuration)
+
+
+def _read_item(item):
+    source, file, format, options = item
+    return read(source=source, file=file, format=format, options=options)
+
+
+def _write_item(item):
+    doc, file, format, options = item
+    return write(doc, file=file, format=format, options=options)
+
+
+def _map(function, items, workers, processes, ordered):
+    import concurrent.futures
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if processes:
+        import_types()  # the workers inherit the configuration
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(configure(read=True),),
+        )
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+    # Bound the number of items in flight (pending or waiting for their turn
+    # in the output), so that large or lazy collections of items are streamed.
+    window = 2 * workers
+    items = enumerate(items)
+    exhausted = False
+    pending = {}
+    results = {}
+    next_index = 0
+    try:
+        while True:
+            while not exhausted and len(pending) + len(results) < window:
+                try:
+                    index, item = next(items)
+                except StopIteration:
+                    exhausted = True
+                else:
+                    pending[executor.submit(function, item)] = index
+            if not pending:
+                break
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                index = pending.pop(future)
+                error = future.exception()
+                result = future.result() if error is None else error
+                if ordered:
+                    results[index] = result
+                else:
+                    yield index, result
+            while next_index in results:
+                yield next_index, results.pop(next_index)
+                next_index += 1
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def read_many(
+    sources=None,
+    files=None,
+    format=None,
+    options=None,
+    workers=None,
+    processes=False,
+    ordered=True,
+):
+    """
+    Read several documents concurrently, with `workers` threads
+    (or processes if `processes` is true).
+
+    Yield `(index, doc)` pairs, in the input order if `ordered` is true
+    or as soon as each document is available otherwise. When the conversion
+    of an item fails, the exception is yielded in place of the document.
+    """
+    if (sources is None) == (files is None):
+        raise ValueError("sources or files should be defined, not both.")
+    if sources is not None:
+        items = ((source, None, format, options) for source in sources)
+    else:
+        items = ((None, file, format, options) for file in files)
+    return _map(_read_item, items, workers, processes, ordered)
+
+
+def write_many(
+    docs,
+    files=None,
+    format=None,
+    options=None,
+    workers=None,
+    processes=False,
+    ordered=True,
+):
+    """
+    Write several documents concurrently, with `workers` threads
+    (or processes if `processes` is true).
+
+    Yield `(index, output)` pairs, in the input order if `ordered` is true
+    or as soon as each output is available otherwise. When the conversion
+    of an item fails, the exception is yielded in place of the output.
+    """
+    if files is None:
+        items = ((doc, None, format, options) for doc in docs)
+    else:
+        items = ((doc, file, format, options) for doc, file in zip(docs, files))
+    return _map(_write_item, items, workers, processes, ordered)
+
+
 # JSON Reader v1
 # ------------------------------------------------------------------------------
 def read_json_v1(json_, type_=None):
-    types = import_types
+    types = import_types()
 
     if type_ is None:
         type_ = types.Pandoc
@@ -563,111 +1005,8 @@ def write_json_v1(object_):
 # JSON Reader v2
 # ------------------------------------------------------------------------------
 def read_json_v2(json_, type_=None):
-    # DEBUG needed. Maybe in Caption makes the process go wrong.
-    #print("type:", type_, "json:", json_)
     types = import_types()
-
-    if type_ is None:
-        type_ = types.Pandoc
-    if isinstance(type_, str):
-        type_ = getattr(types, type_)
-    if not isinstance(type_, list):  # not a type def (yet).
-        if issubclass(type_, types.Type):
-            type_ = type_._def
-        else:  # primitive type
-            return type_(json_)
-
-    #print("typedef:", type_)
-
-
-    if type_[0] == "type":  # type alias
-        type_ = type_[1][1]
-        return read_json_v2(json_, type_)
-    if type_[0] == "list":
-        item_type = type_[1][0]
-        return [read_json_v2(item, item_type) for item in json_]
-    if type_[0] == "tuple":
-        tuple_types = type_[1]
-        return tuple(
-            read_json_v2(item, item_type)
-            for (item, item_type) in zip(json_, tuple_types)
-        )
-    if type_[0] == "map":
-        key_type, value_type = type_[1]
-        return types.map(
-            [
-                (read_json_v2(k, key_type), read_json_v2(v, value_type))
-                for (k, v) in json_.items()
-            ]
-        )
-    if type_[0] == "maybe":
-        value_type = type_[1][0]
-        if json_ == None:
-            return None
-        else:
-            return read_json_v2(json_, value_type)
-
-    data_type = None
-    constructor = None
-    if type_[0] in ("data", "newtype"):
-        data_type = type_
-        constructors = data_type[1][1]
-        if len(constructors) == 1:
-            constructor = constructors[0]
-        else:
-            #print("*", json_)
-            constructor = getattr(types, json_["t"])._def
-    elif type_[0][0] == type_[0][0].upper():
-        constructor = type_
-        constructor_type = getattr(types, constructor[0])
-        data_type = constructor_type.__mro__[2]._def
-
-    single_type_constructor = len(data_type[1][1]) == 1
-    single_constructor_argument = len(constructor[1][1]) == 1
-    is_record = constructor[1][0] == "map"
-
-    json_args = None
-    args = None
-    if constructor[0] == "Pandoc":
-        # TODO; check API version compat
-        meta = read_json_v2(json_["meta"], types.Meta)
-        blocks = read_json_v2(json_["blocks"], ["list", ["Block"]])
-        return types.Pandoc(meta, blocks)
-    elif constructor[0] == "Meta":
-        type_ = ["map", ["String", "MetaValue"]]
-        return types.Meta(read_json_v2(json_, type_))
-    elif not is_record:
-        if single_type_constructor:
-            # For some reason, "Caption", which has a single constructor,
-            # does not erase the type ? Is it an issue of being a "newtype"
-            # and not a "data". That would make sense based on the semantics
-            # of these words. Let's experiment now :
-            # newtype instances are Meta (special case), Format, RowHeadColumns,
-            # RowSpan and ColSpan. Well with pandoc 2.10.1, this intuition is
-            # wrong: RowSpan and ColSpan have their types in the json at least.
-            # Format has its type erased. RowHeadColumns types is not erased either.
-            # So now it's only Format (and Meta) ??? Why ? And where can I see this
-            # in the code ? 
-            # data with single constructor: Row, TableHead, TableBody, TableFoot,
-            # Cell, etc.
-
-            # NOTE : also new: ColWidth has a constructor named ColWidth,
-            #        but there is also a default ; so we can't read hide
-            #        the father type, safely can we ?
-
-            json_args = json_
-        else:
-            json_args = json_.get("c", [])
-        if single_constructor_argument:
-            json_args = [json_args]
-        args = [read_json_v2(jarg, t) for jarg, t in zip(json_args, constructor[1][1])]
-    else:
-        keys = [k for k, t in constructor[1][1]]
-        types_ = [t for k, t in constructor[1][1]]
-        json_args = [json_[k] for k in keys]
-        args = [read_json_v2(jarg, t) for jarg, t in zip(json_args, types_)]
-    C = getattr(types, constructor[0])
-    return C(*args)
+    return codec.decoders(types).get(type_)(json_)
 
 
 # JSON Writer v2
@@ -719,6 +1058,128 @@ def write_json_v2(object_):
     return json_
 
 
+# Streaming JSON Reader
+# ------------------------------------------------------------------------------
+def iter_blocks(file):
+    """
+    Read a pandoc JSON document incrementally from a filename or a file
+    (binary or text): yield its metadata (a `Meta` instance) first,
+    then its blocks, one at a time.
+    """
+    types = import_types()
+    if utils.version_key(_configuration["pandoc_types_version"]) < [1, 17]:
+        read_meta = functools.partial(read_json_v1, type_=types.Meta)
+        read_block = functools.partial(read_json_v1, type_=types.Block)
+    else:
+        read_meta = codec.decoders(types).get(types.Meta)
+        read_block = codec.decoders(types).get(types.Block)
+
+    if not hasattr(file, "read"):
+        with open(file, "rb") as file:
+            yield from iter_blocks(file)
+        return
+
+    for kind, json_ in stream.iter_document(file):
+        if kind == "meta":
+            yield read_meta(json_)
+        else:
+            yield read_block(json_)
+
+
+# Streaming JSON Writer
+# ------------------------------------------------------------------------------
+def dump(doc, file):
+    """
+    Write the JSON representation of a document (or block or inline)
+    incrementally to a filename or a file (binary or text).
+    """
+    doc = _as_document(doc)
+    if not hasattr(file, "write"):
+        with open(file, "wb") as file:
+            return dump(doc, file)
+
+    types = import_types()
+    version = _configuration["pandoc_types_version"]
+    backend = codec.get_backend()
+    writer = stream.Writer(file)
+    if utils.version_key(version) < [1, 17]:
+        backend.dump_value(write_json_v1(doc), writer)
+    else:
+        backend.dump(codec.encoders(types, version), doc, writer)
+    writer.flush()
+
+
+def _dumps(doc):
+    output = io.BytesIO()
+    dump(doc, output)
+    return output.getvalue()
+
+
+# Binary Format
+# ------------------------------------------------------------------------------
+def save(doc, file):
+    """
+    Save a document (or block or inline) in a compact binary format
+    to a filename or a binary file.
+    """
+    doc = _as_document(doc)
+    if not hasattr(file, "write"):
+        with open(file, "wb") as file:
+            return save(doc, file)
+    version = _configuration["pandoc_types_version"]
+    file.write(binary.codec(import_types()).dumps(doc, version))
+
+
+def load(file, lazy=False):
+    """
+    Load a document saved with `pandoc.save` from a filename or a binary file.
+    With `lazy`, the blocks are decoded on first access.
+    """
+    if not hasattr(file, "read"):
+        with open(file, "rb") as file:
+            return load(file, lazy)
+    if configure(read=True) is None:
+        configure(auto=True)
+    version = _configuration["pandoc_types_version"]
+    data = binary.read_file(file)
+    return binary.codec(import_types()).loads(data, version, lazy_blocks=lazy)
+
+
+# Diff and Patch
+# ------------------------------------------------------------------------------
+def diff(old, new):
+    """
+    Return the edit script that changes `old` into `new` (documents or
+    elements): a list of insertions, deletions, replacements and moves.
+    """
+    return delta.diff(old, new, import_types())
+
+
+def patch(doc, script):
+    """
+    Apply the edit script to `doc` (in place) and return the result.
+    The values of the script are inserted as they are (not copied).
+    """
+    return delta.patch(doc, script)
+
+
+# Columnar Export
+# ------------------------------------------------------------------------------
+def to_columns(elt):
+    """
+    Return the nodes of `elt` (a document or an element) in pre-order as
+    parallel arrays: the "kind", "parent", "depth", "position" and text
+    "offsets" of every node, plus the concatenated "text" (UTF-8 bytes)
+    and the type "names" of the kind codes.
+    """
+    return columnar.to_columns(elt, import_types())
+
+
+def from_columns(columns):
+    "Return the document (or element) described by the `columns`."
+    return columnar.from_columns(columns, import_types())
+
+
 # Iteration
 # ------------------------------------------------------------------------------
 
@@ -868,44 +1329,55 @@ def get_parent(doc, elt):
 
 # Functional Transformation Patterns (Scrap-Your-Boilerplate-ish)
 # ------------------------------------------------------------------------------
-def _apply_children(f, elt):
-    types = import_types()
-    children = None
+# Nota: the transforms share the unchanged subtrees of their input: when the
+# children of an element (or list, tuple or dict) are returned unchanged,
+# the element itself is returned, not a copy. Hence a transform that changes
+# nothing returns its input and allocates (almost) nothing.
+
+
+def _apply_children(f, elt, types=None):
+    if types is None:
+        types = import_types()
     if isinstance(elt, types.Type):
-        children = elt[:]
+        children = elt._args
         new_children = [f(child) for child in children]
+        if all(map(operator.is_, new_children, children)):
+            return elt
         return type(elt)(*new_children)
     elif isinstance(elt, dict):
-        children = elt.items()
-        return dict([f(child) for child in children])
-    elif hasattr(elt, "__iter__") and not isinstance(elt, types.String):
-        assert isinstance(elt, list) or isinstance(elt, tuple)
+        children = list(elt.items())
+        new_children = [f(child) for child in children]
+        if all(map(operator.is_, new_children, children)):
+            return elt
+        return dict(new_children)
+    elif isinstance(elt, (list, tuple)):
         new_children = [f(child) for child in elt]
+        if all(map(operator.is_, new_children, elt)):
+            return elt
         return type(elt)(new_children)
     else:
-        assert type(elt) in [bool, int, float, str]
+        assert elt is None or type(elt) in [bool, int, float, str]
         return elt
 
-def apply(f, elt=None): # apply the transform f bottom-up
-    f_ = f
 
-    def f(elt): # sugar : no return value means no change 
-        new_elt = f_(elt)
-        if new_elt is not None:
-            return new_elt
-        else:
-            return elt
-
-    def apply_(f, elt=None):
-        if elt is None:  # functional style / decorator
-            return lambda elt: apply_(f, elt)
-
-        def apply_descendants(elt):
-            return _apply_children(apply_(f), elt)
+def apply(f, elt=None, changed=False):  # apply the transform f bottom-up
+    """
+    Apply the transform `f` to `elt` and its descendants (bottom-up);
+    with `changed`, return the result and whether `elt` has changed.
+    """
+    if elt is None:  # functional style / decorator
+        return lambda elt: apply(f, elt, changed)
+    types = import_types()
 
-        return f(apply_descendants(elt))
+    def transform(elt):
+        elt = _apply_children(transform, elt, types)
+        new_elt = f(elt)
+        return elt if new_elt is None else new_elt  # sugar: None means no change
 
-    return apply_(f, elt)
+    new_elt = transform(elt)
+    if changed:
+        return new_elt, new_elt is not elt
+    return new_elt
 
 
 # Main Entry Point
@@ -917,6 +1389,8 @@ def apply(f, elt=None): # apply the transform f bottom-up
 #       not to have "pdf" as an output format per se, that means that we
 #       cannot output pdf at all.
 def main():
+    import argparse
+
     prog = "python -m pandoc"
     description = "Read/write pandoc documents with Python"
     parser = argparse.ArgumentParser(prog=prog, description=description)
@@ -970,9 +1444,7 @@ def main():
         else:
             file = open(args.file, mode="r", encoding="utf-8")
             doc_string = file.read()
-        types = import_types()
-        globs = types.__dict__.copy()
-        doc = eval(doc_string, globs)
+        doc = read(doc_string, format="python")
         if args.output is None:
             output = sys.stdout.buffer
         else:
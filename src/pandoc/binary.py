@@ -0,0 +1,310 @@
+# coding: utf-8
+
+# Python 3 Standard Library
+import array
+import io
+import mmap
+import struct
+import sys
+
+# Pandoc
+from . import lazy
+
+
+# Binary Format
+# ------------------------------------------------------------------------------
+
+# A file starts with a fixed-size header: the magic number, the version of the
+# format, the version of pandoc-types (the numeric tags of the constructors
+# depend on it) and the offsets of the sections:
+#
+#   - the metadata,
+#
+#   - the blocks, one after the other,
+#
+#   - the block table: the offsets of the blocks (unsigned 64-bit integers),
+#
+#   - the string table: the number of strings and the size of their data,
+#     the length (in characters) of every string and the UTF-8 encoding
+#     of the concatenated strings (lone surrogates, which JSON strings may
+#     hold, are encoded as single characters with "surrogatepass").
+#
+# Every value starts with a code (a varint, usually a single byte): the kind
+# of primitive value or the tag of its constructor, derived from the order of
+# the type definitions. The arguments of a constructor follow its tag. Strings
+# are interned: they are stored as their index in the string table. Integers
+# are stored as varints, floats as IEEE 754 doubles.
+#
+# All the numbers are little-endian.
+
+MAGIC = b"\x89PANDOC\n"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sI16sQQQQ")
+
+NONE, FALSE, TRUE, INT, NEGATIVE_INT, FLOAT, STRING, LIST, TUPLE, MAP = range(10)
+CONSTRUCTOR = 16  # tag of the first constructor
+
+_double = struct.Struct("<d")
+_sizes = struct.Struct("<QQ")
+
+
+def _array(typecode, data=b""):
+    "Array of little-endian numbers"
+    numbers = array.array(typecode)
+    numbers.frombytes(data)
+    if sys.byteorder == "big":
+        numbers.byteswap()
+    return numbers
+
+
+def _array_bytes(numbers):
+    if sys.byteorder == "big":
+        numbers = array.array(numbers.typecode, numbers)
+        numbers.byteswap()
+    return numbers.tobytes()
+
+
+class Codec:
+    def __init__(self, types):
+        self.types = types
+        self.Pandoc = types.Pandoc  # changes when the types are re-created
+        constructors = [
+            type_
+            for type_ in types._types_dict.values()  # in definition order
+            if isinstance(type_, type) and issubclass(type_, types.Constructor)
+        ]
+        self.tags = {C: CONSTRUCTOR + i for i, C in enumerate(constructors)}
+        self.constructors = constructors
+
+    def dumps(self, doc, version):
+        "Return the binary representation of a `Pandoc` instance."
+        tags = self.tags
+        strings = {}  # string -> index
+        output = bytearray(HEADER.size)
+        append = output.append
+
+        def write_varint(number):
+            while number >= 0x80:
+                append(number & 0x7F | 0x80)
+                number >>= 7
+            append(number)
+
+        def encode(object_):
+            type_ = type(object_)
+            tag = tags.get(type_)
+            if tag is not None:
+                write_varint(tag)
+                for arg in object_._args:
+                    encode(arg)
+            elif type_ is str:
+                index = strings.get(object_)
+                if index is None:
+                    index = strings[object_] = len(strings)
+                append(STRING)
+                write_varint(index)
+            elif type_ is list or type_ is tuple:
+                append(LIST if type_ is list else TUPLE)
+                write_varint(len(object_))
+                for item in object_:
+                    encode(item)
+            elif type_ is int:
+                if object_ >= 0:
+                    append(INT)
+                    write_varint(object_)
+                else:
+                    append(NEGATIVE_INT)
+                    write_varint(-object_ - 1)
+            elif object_ is None:
+                append(NONE)
+            elif type_ is bool:
+                append(TRUE if object_ else FALSE)
+            elif type_ is float:
+                append(FLOAT)
+                output.extend(_double.pack(object_))
+            elif type_ is dict:
+                append(MAP)
+                write_varint(len(object_))
+                for key, value in object_.items():
+                    encode(key)
+                    encode(value)
+            else:  # subclasses of the primitive types (e.g. lazy lists)
+                for base in (bool, int, float, str, list, tuple, dict):
+                    if isinstance(object_, base):
+                        return encode(base(object_))
+                error = "Object of type {0} cannot be saved"
+                raise TypeError(error.format(type_.__name__))
+
+        meta, blocks = doc._args
+        meta_offset = len(output)
+        encode(meta)
+        offsets = _array("Q")
+        for block in blocks:
+            offsets.append(len(output))
+            encode(block)
+        table_offset = len(output)
+        output += _array_bytes(offsets)
+
+        strings_offset = len(output)
+        lengths = _array("I", b"")
+        lengths.extend(len(string) for string in strings)
+        data = "".join(strings).encode("utf-8", "surrogatepass")
+        output += _sizes.pack(len(strings), len(data))
+        output += _array_bytes(lengths)
+        output += data
+
+        output[: HEADER.size] = HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            version.encode("ascii"),
+            meta_offset,
+            table_offset,
+            len(offsets),
+            strings_offset,
+        )
+        return output
+
+    def loads(self, data, version, lazy_blocks=False):
+        """
+        Return the document stored in `data` (bytes or mmap); with
+        `lazy_blocks`, the blocks are decoded on first access.
+        """
+        if data[: len(MAGIC)] != MAGIC:
+            raise ValueError("not a binary pandoc document")
+        header = HEADER.unpack_from(data, 0)
+        _, format_version, types_version = header[:3]
+        meta_offset, table_offset, count, strings_offset = header[3:]
+        types_version = types_version.rstrip(b"\0").decode("ascii")
+        if format_version != FORMAT_VERSION:
+            error = "unsupported version {0} of the binary format"
+            raise ValueError(error.format(format_version))
+        if types_version != version:
+            error = "document saved with pandoc-types {0}, not {1}"
+            raise ValueError(error.format(types_version, version))
+
+        number, size = _sizes.unpack_from(data, strings_offset)
+        start = strings_offset + _sizes.size
+        lengths = _array("I", data[start : start + 4 * number])
+        text = data[start + 4 * number : start + 4 * number + size]
+        text = str(text, "utf-8", "surrogatepass")
+        strings = []
+        position = 0
+        for length in lengths:
+            strings.append(text[position : position + length])
+            position += length
+
+        decode = self._decoder(data, strings)
+        meta = decode(meta_offset)
+        offsets = _array("Q", data[table_offset : table_offset + 8 * count])
+        if lazy_blocks:
+            blocks = lazy.LazyList(offsets, decode)
+        else:
+            blocks = [decode(offset) for offset in offsets]
+        return self.Pandoc(meta, blocks)
+
+    def _decoder(self, data, strings):
+        "Return the decoder of the values at an offset of `data`."
+        view = memoryview(data)
+        next_byte = None  # of the bytes being decoded
+
+        def read_varint(byte):
+            number = byte & 0x7F
+            shift = 7
+            while byte >= 0x80:
+                byte = next_byte()
+                number |= (byte & 0x7F) << shift
+                shift += 7
+            return number
+
+        def read_int():
+            byte = next_byte()
+            return byte if byte < 0x80 else read_varint(byte)
+
+        def read_negative_int():
+            return -read_int() - 1
+
+        def read_float():
+            return _double.unpack(bytes([next_byte() for _ in range(8)]))[0]
+
+        def read_string():
+            byte = next_byte()
+            return strings[byte if byte < 0x80 else read_varint(byte)]
+
+        def read_list():
+            return [decode() for _ in range(read_int())]
+
+        def read_tuple():
+            return tuple([decode() for _ in range(read_int())])
+
+        def read_map():
+            items = {}
+            for _ in range(read_int()):
+                key = decode()
+                items[key] = decode()
+            return items
+
+        def read_constructor(C):
+            arity = len(C._def[1][1])
+            if arity == 0:
+                return lambda: C()
+            elif arity == 1:
+                return lambda: C(decode())
+            elif arity == 2:
+                return lambda: C(decode(), decode())
+            elif arity == 3:
+                return lambda: C(decode(), decode(), decode())
+            else:
+                return lambda: C(*[decode() for _ in range(arity)])
+
+        readers = [None] * CONSTRUCTOR
+        readers[NONE : MAP + 1] = [
+            lambda: None,
+            lambda: False,
+            lambda: True,
+            read_int,
+            read_negative_int,
+            read_float,
+            read_string,
+            read_list,
+            read_tuple,
+            read_map,
+        ]
+        readers += [read_constructor(C) for C in self.constructors]
+
+        def decode():
+            code = next_byte()
+            if code >= 0x80:
+                code = read_varint(code)
+            return readers[code]()
+
+        def decode_at(offset):
+            nonlocal next_byte
+            next_byte = iter(view[offset:]).__next__
+            return decode()
+
+        return decode_at
+
+
+def read_file(file):
+    """
+    Return the content of a binary file from its current position to its end
+    (memory-mapped when possible); the file is then at its end.
+    """
+    try:
+        start = file.tell()
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):  # e.g. io.BytesIO, empty file
+        return file.read()
+    file.seek(0, io.SEEK_END)
+    return data if start == 0 else memoryview(data)[start:]
+
+
+_codec = None
+
+
+def codec(types):
+    "Return the (cached) binary codec of the current pandoc types."
+    global _codec
+    current = _codec
+    if current is None or current.Pandoc is not types.Pandoc:
+        current = _codec = Codec(types)
+    return current
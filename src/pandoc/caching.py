@@ -0,0 +1,260 @@
+# coding: utf-8
+
+# Python 3 Standard Library
+import hashlib
+import json
+import marshal
+import os
+import tempfile
+import threading
+
+# Pandoc
+from . import about
+
+
+# Content-Addressed Disk Cache
+# ------------------------------------------------------------------------------
+
+# Entries are stored in `<path>/<key[:2]>/<key[2:]>`, where `key` is the
+# SHA-256 digest of the parts that determine the cached value. Hits refresh
+# the modification time of the entry; when the total size of the entries
+# exceeds `max_size`, the least recently used entries are removed.
+
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+
+def key(*parts):
+    hash_ = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        hash_.update(len(part).to_bytes(8, "little"))
+        hash_.update(part)
+    return hash_.hexdigest()
+
+
+class Cache:
+    def __init__(self, path, max_size=None):
+        if max_size is None:
+            max_size = DEFAULT_MAX_SIZE
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_size = max_size
+        self.stats = {"hits": 0, "misses": 0}
+        self._size = None  # total size of the entries, computed on demand
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def _filename(self, key):
+        return os.path.join(self.path, key[:2], key[2:])
+
+    def _entries(self):
+        entries = []
+        for dirname in os.listdir(self.path):
+            dirpath = os.path.join(self.path, dirname)
+            if len(dirname) != 2 or not os.path.isdir(dirpath):
+                continue
+            for filename in os.listdir(dirpath):
+                if len(filename) != 62:  # skip partially written entries
+                    continue
+                filepath = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(filepath)
+                except OSError:  # removed concurrently
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, filepath))
+        return entries
+
+    def get(self, key):
+        filename = self._filename(key)
+        try:
+            with open(filename, "rb") as file:
+                data = file.read()
+            os.utime(filename)
+        except OSError:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        with self._lock:
+            self.stats["hits"] += 1
+        return data
+
+    def set(self, key, data):
+        filename = self._filename(key)
+        dirname = os.path.dirname(filename)
+        os.makedirs(dirname, exist_ok=True)
+        fd, tmp_filename = tempfile.mkstemp(dir=dirname)
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        with self._lock:
+            try:
+                old_size = os.stat(filename).st_size  # the replaced entry
+            except OSError:
+                old_size = 0
+            os.replace(tmp_filename, filename)
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data) - old_size
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        size = sum(size for _, size, _ in entries)
+        target = 0.9 * self.max_size
+        for _, entry_size, filepath in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(filepath)
+            except OSError:
+                continue
+            size -= entry_size
+        self._size = size
+
+    def clear(self):
+        with self._lock:
+            for _, _, filepath in self._entries():
+                try:
+                    os.remove(filepath)
+                except OSError:
+                    pass
+            self._size = 0
+
+    def info(self):
+        with self._lock:
+            entries = self._entries()
+            self._size = sum(size for _, size, _ in entries)
+            info = {
+                "path": self.path,
+                "max_size": self.max_size,
+                "size": self._size,
+                "entries": len(entries),
+            }
+            info.update(self.stats)
+        return info
+
+
+# Executable Cache
+# ------------------------------------------------------------------------------
+
+# The version of a pandoc executable (and the matching pandoc-types version)
+# is stored on disk, so that new processes do not need to run `pandoc
+# --version`. An entry is valid as long as the size and modification time
+# of the executable (and the version of this library) are unchanged.
+# The path of the pandoc program found with `configure(auto=True)` is stored
+# in the same file (key "auto"), valid as long as the PATH is unchanged.
+
+
+def cache_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if not cache_home:
+        cache_home = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "pandoc-python")
+
+
+def executables_filename():
+    return os.path.join(cache_dir(), "executables.json")
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return [about.version, stat.st_size, stat.st_mtime_ns]
+
+
+def _load_executables():
+    try:
+        with open(executables_filename(), "r", encoding="utf-8") as file:
+            entries = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def get_executable(path):
+    try:
+        stamp = _stamp(path)
+    except OSError:
+        return None
+    entry = _load_executables().get(os.path.abspath(path))
+    if entry is None or entry.get("stamp") != stamp:
+        return None
+    return entry.get("info")
+
+
+def set_executable(path, info):
+    try:
+        entries = _load_executables()
+        entries[os.path.abspath(path)] = {"stamp": _stamp(path), "info": info}
+        data = json.dumps(entries).encode("utf-8")
+        _write_file(executables_filename(), data)
+    except OSError:  # the cache is an optimization; ignore it if unusable
+        pass
+
+
+def _search_path():
+    return os.environ.get("PATH", os.defpath)
+
+
+def get_auto_path():
+    entry = _load_executables().get("auto")
+    if not isinstance(entry, dict) or entry.get("search_path") != _search_path():
+        return None
+    path = entry.get("path")
+    if not isinstance(path, str) or not os.access(path, os.X_OK):
+        return None
+    return path
+
+
+def set_auto_path(path):
+    try:
+        entries = _load_executables()
+        entries["auto"] = {"search_path": _search_path(), "path": path}
+        data = json.dumps(entries).encode("utf-8")
+        _write_file(executables_filename(), data)
+    except OSError:  # the cache is an optimization; ignore it if unusable
+        pass
+
+
+def clear_executables():
+    try:
+        os.remove(executables_filename())
+    except OSError:
+        pass
+
+
+# Type Definitions Cache
+# ------------------------------------------------------------------------------
+
+# The parsed type definitions of a pandoc-types version (and their docstrings)
+# are stored as marshal files, named after a hash of the definitions source,
+# so that the types can be created without running the parser.
+
+
+def _definitions_filename(source):
+    name = key(about.version, source) + ".marshal"
+    return os.path.join(cache_dir(), "definitions", name)
+
+
+def get_definitions(source):
+    try:
+        with open(_definitions_filename(source), "rb") as file:
+            return marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def set_definitions(source, definitions):
+    try:
+        _write_file(_definitions_filename(source), marshal.dumps(definitions))
+    except OSError:
+        pass
+
+
+def _write_file(filename, data):
+    dirname = os.path.dirname(filename)
+    os.makedirs(dirname, exist_ok=True)
+    fd, tmp_filename = tempfile.mkstemp(dir=dirname)
+    with os.fdopen(fd, "wb") as file:
+        file.write(data)
+    os.replace(tmp_filename, filename)
@@ -0,0 +1,929 @@
+# coding: utf-8
+
+# Python 3 Standard Library
+import json
+import math
+import sys
+import threading
+from json.encoder import encode_basestring_ascii as encode_string
+
+# Pandoc
+from . import shared
+
+
+# Compiled JSON Decoder
+# ------------------------------------------------------------------------------
+
+# Instead of interpreting the type definitions for every node of a document,
+# the definitions are compiled (once for a given set of pandoc types) into a
+# decoding function per type and per constructor. The decoder of a data type
+# with several constructors is a lookup of the tag "t" in a dispatch table.
+# With `sharing`, the strings are interned and the empty Attrs are shared
+# (see `pandoc.shared`).
+
+
+class Decoders:
+    def __init__(self, types, sharing=False):
+        self.types = types
+        self.Pandoc = types.Pandoc  # changes when the types are re-created
+        self.sharing = sharing
+        self._decoders = {}  # decoders ready to be used
+        self._table = {}  # type name -> decoder (maybe still being compiled)
+        self._pending = set()  # types being compiled
+        self._fixers = {}
+        self._object_hook = None
+        self._lock = threading.Lock()
+
+    def _key(self, type_):
+        "Normalize a type (name, class or type definition)."
+        if type_ is None:
+            return "Pandoc"
+        elif isinstance(type_, type) and issubclass(type_, self.types.Type):
+            return type_.__name__
+        else:
+            return type_
+
+    def get(self, type_=None):
+        "Return the decoder of a type (name, class or type definition)."
+        type_ = self._key(type_)
+        if isinstance(type_, type):  # primitive type
+            return type_
+        key = type_ if isinstance(type_, str) else repr(type_)
+        decoder = self._decoders.get(key)
+        if decoder is None:
+            with self._lock:
+                decoder = self._decoders.get(key)
+                if decoder is None:
+                    decoder = self._decoders[key] = self._compile(type_)
+        return decoder
+
+    def _compile(self, type_):
+        if isinstance(type_, str):
+            return self._named(type_)
+        kind = type_[0]
+        if kind == "type":  # type alias
+            decoder = self._compile(type_[1][1])
+            if self.sharing and type_[1][0] == "Attr":
+                decoder = _share_attr(decoder)
+            return decoder
+        elif kind == "list":
+            return self._list(type_[1][0])
+        elif kind == "tuple":
+            return self._tuple(type_[1])
+        elif kind == "map":
+            return self._map(*type_[1])
+        elif kind == "maybe":
+            return self._maybe(type_[1][0])
+        elif kind in ("data", "newtype"):
+            return self._data(type_)
+        else:
+            return self._constructor(type_)
+
+    def _named(self, name):
+        table = self._table
+        decoder = table.get(name)
+        if decoder is not None:
+            return decoder
+        if name in self._pending:  # recursive type, resolved at runtime
+            return lambda json_: table[name](json_)
+
+        types = self.types
+        type_ = getattr(types, name)
+        if not issubclass(type_, types.Type):  # primitive type
+            decoder = sys.intern if self.sharing and type_ is str else type_
+        else:
+            type_def = type_._def
+            if issubclass(type_, types.Constructor):
+                # The constructor may hide a data type with the same name
+                # (e.g. ColWidth), and then the tag "t" may be needed.
+                data_type_def = type_.__mro__[2]._def
+                if data_type_def[1][0] == name:
+                    type_def = data_type_def
+            self._pending.add(name)
+            try:
+                decoder = self._compile(type_def)
+            finally:
+                self._pending.discard(name)
+        table[name] = decoder
+        return decoder
+
+    def _list(self, item_type):
+        decode_item = self._compile(item_type)
+
+        def decode(json_):
+            return [decode_item(item) for item in json_]
+
+        return decode
+
+    def _tuple(self, item_types):
+        decoders = [self._compile(item_type) for item_type in item_types]
+        if len(decoders) == 2:
+            decode_0, decode_1 = decoders
+
+            def decode(json_):
+                return (decode_0(json_[0]), decode_1(json_[1]))
+
+        elif len(decoders) == 3:
+            decode_0, decode_1, decode_2 = decoders
+
+            def decode(json_):
+                return (decode_0(json_[0]), decode_1(json_[1]), decode_2(json_[2]))
+
+        else:
+
+            def decode(json_):
+                return tuple([d(item) for d, item in zip(decoders, json_)])
+
+        return decode
+
+    def _map(self, key_type, value_type):
+        decode_key = self._compile(key_type)
+        decode_value = self._compile(value_type)
+        map_ = self.types.map
+
+        def decode(json_):
+            return map_([(decode_key(k), decode_value(v)) for k, v in json_.items()])
+
+        return decode
+
+    def _maybe(self, value_type):
+        decode_value = self._compile(value_type)
+
+        def decode(json_):
+            return None if json_ is None else decode_value(json_)
+
+        return decode
+
+    def _data(self, type_def):
+        name, constructors = type_def[1]
+        if len(constructors) == 1:
+            return self._constructor(constructors[0])
+
+        # Register the decoder before its constructors are compiled,
+        # since they may refer to it (e.g. Block in BlockQuote).
+        dispatch = {}
+
+        def decode(json_):
+            return dispatch[json_["t"]](json_)
+
+        self._table[name] = decode
+        for constructor in constructors:
+            dispatch[constructor[0]] = self._constructor(constructor)
+        return decode
+
+    def _constructor(self, constructor):
+        types = self.types
+        name, (kind, arg_types) = constructor
+        C = getattr(types, name)
+        data_type_def = C.__mro__[2]._def
+
+        if name == "Pandoc":
+            # TODO; check API version compat
+            decode_meta = self._named("Meta")
+            decode_blocks = self._compile(["list", ["Block"]])
+
+            def decode(json_):
+                return C(decode_meta(json_["meta"]), decode_blocks(json_["blocks"]))
+
+            return decode
+        elif name == "Meta":
+            decode_map = self._compile(["map", ["String", "MetaValue"]])
+
+            def decode(json_):
+                return C(decode_map(json_))
+
+            return decode
+        elif kind == "map":  # record
+            fields = [(key, self._compile(type_)) for key, type_ in arg_types]
+
+            def decode(json_):
+                return C(*[decode_(json_[key]) for key, decode_ in fields])
+
+            return decode
+
+        decoders = [self._compile(arg_type) for arg_type in arg_types]
+        # The JSON of the constructors of single-constructor types is not
+        # tagged: only their arguments (or single argument) are stored
+        # (e.g. Format, whose JSON is a single string).
+        single_type_constructor = len(data_type_def[1][1]) == 1
+        if len(decoders) == 0:
+
+            def decode(json_):
+                return C()
+
+        elif len(decoders) == 1:
+            decode_arg = decoders[0]
+            if single_type_constructor:
+
+                def decode(json_):
+                    return C(decode_arg(json_))
+
+            else:
+
+                def decode(json_):
+                    return C(decode_arg(json_["c"]))
+
+        elif len(decoders) == 2:
+            decode_0, decode_1 = decoders
+            if single_type_constructor:
+
+                def decode(json_):
+                    return C(decode_0(json_[0]), decode_1(json_[1]))
+
+            else:
+
+                def decode(json_):
+                    args = json_["c"]
+                    return C(decode_0(args[0]), decode_1(args[1]))
+
+        else:
+            if single_type_constructor:
+
+                def decode(json_):
+                    return C(*[d(arg) for d, arg in zip(decoders, json_)])
+
+            else:
+
+                def decode(json_):
+                    return C(*[d(arg) for d, arg in zip(decoders, json_["c"])])
+
+        return decode
+
+    # Single-Pass Decoding
+    # --------------------------------------------------------------------------
+
+    # `json.loads` calls an object hook on every JSON object that it has
+    # parsed, which instantiates at once the tagged constructors (the
+    # constructors of data types with several constructors, such as Str or
+    # Para), so that the intermediate dicts are released immediately. The
+    # arguments of these constructors are already decoded, except when their
+    # JSON representation is ambiguous: tuples (such as Attr), untagged
+    # constructors (such as Format or Meta), records (such as Citation)
+    # and doubles that are integers in JSON. The "fixers" take care of these
+    # positions; the positions which need no fix are not visited again.
+
+    def loads(self, string, type_=None):
+        "Decode a JSON document (string or bytes) directly."
+        with self._lock:
+            if self._object_hook is None:
+                self._object_hook = self._compile_object_hook()
+            type_ = self._key(type_)
+            fix = type_ if isinstance(type_, type) else self._fixer(type_)
+        value = json.loads(string, object_hook=self._object_hook)
+        return value if fix is None else fix(value)
+
+    def _compile_object_hook(self):
+        types = self.types
+        builders = {}
+        for type_ in vars(types).values():
+            if isinstance(type_, type) and issubclass(type_, types.Constructor):
+                if type_ is not types.Constructor:
+                    build = self._builder(type_)
+                    if build is not None:
+                        builders[type_.__name__] = build
+
+        def object_hook(object_):
+            name = object_.get("t")
+            if type(name) is str:
+                build = builders.get(name)
+                if build is not None:
+                    return build(object_)
+            return object_
+
+        return object_hook
+
+    def _builder(self, C):
+        "Instantiate a tagged constructor from its (partially decoded) JSON."
+        if len(C.__mro__[2]._def[1][1]) == 1:  # untagged
+            return None
+        fixers = [self._fixer(arg_type) for arg_type in C._def[1][1]]
+        if len(fixers) == 0:
+
+            def build(object_):
+                return C()
+
+        elif len(fixers) == 1:
+            fix = fixers[0]
+            if fix is None:
+
+                def build(object_):
+                    return C(object_["c"])
+
+            else:
+
+                def build(object_):
+                    return C(fix(object_["c"]))
+
+        elif all(fix is None for fix in fixers):
+
+            def build(object_):
+                return C(*object_["c"])
+
+        else:
+            fixers = [fix or _identity for fix in fixers]
+
+            def build(object_):
+                return C(*[fix(arg) for fix, arg in zip(fixers, object_["c"])])
+
+        return build
+
+    def _fixer(self, type_):
+        "Return the fixer of a type (or None when no fix is needed)."
+        fixers = self._fixers
+        key = type_ if isinstance(type_, str) else repr(type_)
+        if key in fixers:
+            return fixers[key]
+        if key in self._pending:  # recursive type, resolved at runtime
+            return lambda json_: fixers[key](json_)
+        self._pending.add(key)
+        try:
+            fix = fixers[key] = self._compile_fixer(type_)
+        finally:
+            self._pending.discard(key)
+        return fix
+
+    def _compile_fixer(self, type_):
+        types = self.types
+        if isinstance(type_, str):
+            type_ = getattr(types, type_)
+            if not issubclass(type_, types.Type):  # primitive type
+                if self.sharing and type_ is str:
+                    return sys.intern
+                return float if type_ is float else None
+            if issubclass(type_, types.Constructor):
+                data_type_def = type_.__mro__[2]._def
+                if data_type_def[1][0] == type_.__name__:
+                    type_ = data_type_def
+                else:
+                    type_ = type_._def
+            else:
+                type_ = type_._def
+
+        kind = type_[0]
+        if kind == "type":  # type alias
+            fix = self._fixer(type_[1][1])
+            if self.sharing and type_[1][0] == "Attr":
+                fix = _share_attr(fix or _identity)
+            return fix
+        elif kind == "list":
+            fix_item = self._fixer(type_[1][0])
+            if fix_item is None:
+                return None
+            return lambda json_: [fix_item(item) for item in json_]
+        elif kind == "tuple":
+            fixers = [self._fixer(item_type) or _identity for item_type in type_[1]]
+            return lambda json_: tuple([fix(x) for fix, x in zip(fixers, json_)])
+        elif kind == "map":
+            fix_key, fix_value = [self._fixer(t) or _identity for t in type_[1]]
+            map_ = types.map
+            if fix_key is fix_value is _identity and map_ is dict:
+                return None
+            return lambda json_: map_(
+                [(fix_key(k), fix_value(v)) for k, v in json_.items()]
+            )
+        elif kind == "maybe":
+            fix_value = self._fixer(type_[1][0])
+            if fix_value is None:
+                return None
+            return lambda json_: None if json_ is None else fix_value(json_)
+        elif kind in ("data", "newtype"):
+            constructors = type_[1][1]
+            if len(constructors) > 1:  # tagged, decoded by the object hook
+                return None
+            return self._fixer(constructors[0])
+
+        # Constructor
+        name, (kind, arg_types) = type_
+        C = getattr(types, name)
+        if len(C.__mro__[2]._def[1][1]) > 1:  # tagged
+            return None
+        elif name == "Pandoc":
+            fix_meta = self._fixer("Meta") or _identity
+            fix_blocks = self._fixer(["list", ["Block"]]) or _identity
+            return lambda json_: C(
+                fix_meta(json_["meta"]), fix_blocks(json_["blocks"])
+            )
+        elif name == "Meta":
+            fix_map = self._fixer(["map", ["String", "MetaValue"]]) or _identity
+            return lambda json_: C(fix_map(json_))
+        elif kind == "map":  # record
+            fields = [(k, self._fixer(t) or _identity) for k, t in arg_types]
+            return lambda json_: C(*[fix(json_[k]) for k, fix in fields])
+        elif len(arg_types) == 1:
+            fix_arg = self._fixer(arg_types[0]) or _identity
+            return lambda json_: C(fix_arg(json_))
+        else:
+            fixers = [self._fixer(arg_type) or _identity for arg_type in arg_types]
+            return lambda json_: C(*[fix(arg) for fix, arg in zip(fixers, json_)])
+
+
+def _identity(json_):
+    return json_
+
+
+def _share_attr(decode):
+    "Decode the empty Attrs as the shared one."
+    empty = shared.EMPTY_ATTR
+
+    def decode_attr(json_):
+        if json_[0] or json_[1] or json_[2]:
+            return decode(json_)
+        return empty
+
+    return decode_attr
+
+
+_decoders = None
+
+
+def decoders(types):
+    "Return the (cached) decoders of the current pandoc types."
+    global _decoders
+    current = _decoders
+    sharing = shared.enabled()
+    if (
+        current is None
+        or current.Pandoc is not types.Pandoc
+        or current.sharing is not sharing
+    ):
+        current = _decoders = Decoders(types, sharing)
+    return current
+
+
+# Compiled JSON Encoder
+# ------------------------------------------------------------------------------
+
+# The JSON text is generated directly (the same text as `json.dumps` applied
+# to the output of `write_json_v2`): every constructor has a precompiled writer
+# that appends its fragments of text to a list. The writers are selected by
+# the type of the objects (not by the type definitions), to support the same
+# documents as `write_json_v2`.
+
+FLUSH_SIZE = 1024  # number of fragments to buffer when dumping documents
+
+
+def _float_repr(object_):
+    if object_ != object_:
+        return "NaN"
+    elif object_ == math.inf:
+        return "Infinity"
+    elif object_ == -math.inf:
+        return "-Infinity"
+    else:
+        return float.__repr__(object_)
+
+
+def _key_repr(key):  # same conversion of the keys as json.dumps
+    if isinstance(key, str):
+        return encode_string(key)
+    elif isinstance(key, float):
+        return encode_string(_float_repr(key))
+    elif key is True or key is False or key is None:
+        return encode_string(json.dumps(key))
+    elif isinstance(key, int):
+        return encode_string(int.__repr__(key))
+    else:
+        error = "keys must be str, int, float, bool or None, not {0}"
+        raise TypeError(error.format(type(key).__name__))
+
+
+def _finite(args):
+    "Return False if `args` (lists and tuples) hold a non-finite float."
+    for arg in args:
+        if type(arg) is float:
+            if not math.isfinite(arg):
+                return False
+        elif isinstance(arg, (list, tuple)) and not _finite(arg):
+            return False
+    return True
+
+
+def _mentions(definition, names):
+    "Return True if the (repr of the) type `definition` mentions a type of `names`."
+    return any(repr(name) in definition for name in names)
+
+
+class Encoders:
+    def __init__(self, types, version):
+        self.types = types
+        self.Pandoc = types.Pandoc  # changes when the types are re-created
+        self._api_version = json.dumps([int(n) for n in version.split(".")])
+        self._header = '{"pandoc-api-version": ' + self._api_version + ', "meta": '
+        self._defaults = {}  # type -> shallow representation (see default)
+        writers = self._writers = {}  # type -> writer(object_, append)
+        compile_ = self._compile
+
+        def encode(object_, append):
+            writer = writers.get(type(object_))
+            if writer is None:
+                writer = compile_(type(object_))
+            writer(object_, append)
+
+        def write_list(object_, append):
+            if not object_:
+                append("[]")
+                return
+            append("[")
+            items = iter(object_)
+            encode(next(items), append)
+            for item in items:
+                append(", ")
+                writer = writers.get(type(item))
+                if writer is None:
+                    writer = compile_(type(item))
+                writer(item, append)
+            append("]")
+
+        def write_dict(object_, append):
+            if not object_:
+                append("{}")
+                return
+            separator = "{"
+            for key, value in object_.items():
+                append(separator)
+                append(_key_repr(key))
+                append(": ")
+                encode(value, append)
+                separator = ", "
+            append("}")
+
+        self.encode = encode
+        self._write_list = write_list
+        self._write_dict = write_dict
+        writers.update(
+            {
+                str: lambda object_, append: append(encode_string(object_)),
+                int: lambda object_, append: append(int.__repr__(object_)),
+                float: lambda object_, append: append(_float_repr(object_)),
+                bool: lambda object_, append: append("true" if object_ else "false"),
+                type(None): lambda object_, append: append("null"),
+                list: write_list,
+                tuple: write_list,
+                dict: write_dict,
+            }
+        )
+
+    def _compile(self, type_):
+        "Create (and register) the writer of the instances of `type_`."
+        if issubclass(type_, self.types.Constructor):
+            writer = self._constructor(type_)
+        elif issubclass(type_, (list, tuple)):
+            writer = self._write_list
+        elif issubclass(type_, dict):
+            writer = self._write_dict
+        else:  # other primitive types
+
+            def writer(object_, append):
+                append(json.dumps(object_))
+
+        self._writers[type_] = writer
+        return writer
+
+    def _constructor(self, type_):
+        encode = self.encode
+        write_list = self._write_list
+        name = type_.__name__
+        kind, arg_types = type_._def[1]
+        data_type_def = type_.__mro__[2]._def
+        single_type_constructor = len(data_type_def[1][1]) == 1
+
+        if type_ is self.Pandoc:
+            header = self._header
+
+            def write(object_, append):
+                meta, blocks = object_._args
+                append(header)
+                encode(meta._args[0], append)
+                append(', "blocks": ')
+                encode(blocks, append)
+                append("}")
+
+        elif kind == "map":  # record
+            head = "{" if single_type_constructor else '{"t": ' + json.dumps(name)
+            separator = "" if single_type_constructor else ", "
+            prefixes = []
+            for key, _ in arg_types:
+                prefixes.append(separator + json.dumps(key) + ": ")
+                separator = ", "
+
+            def write(object_, append):
+                append(head)
+                for prefix, arg in zip(prefixes, object_._args):
+                    append(prefix)
+                    encode(arg, append)
+                append("}")
+
+        elif single_type_constructor:  # untagged
+            if len(arg_types) == 1:
+
+                def write(object_, append):
+                    encode(object_._args[0], append)
+
+            else:
+
+                def write(object_, append):
+                    write_list(object_._args, append)
+
+        elif len(arg_types) == 0:
+            text = '{"t": ' + json.dumps(name) + "}"
+
+            def write(object_, append):
+                append(text)
+
+        else:
+            head = '{"t": ' + json.dumps(name) + ', "c": '
+            if len(arg_types) == 1:
+
+                def write(object_, append):
+                    append(head)
+                    encode(object_._args[0], append)
+                    append("}")
+
+            else:
+
+                def write(object_, append):
+                    append(head)
+                    write_list(object_._args, append)
+                    append("}")
+
+        return write
+
+    def default(self, object_):
+        """
+        Return a shallow representation of a constructor instance, made of
+        lists, dicts and arguments of the instance (for orjson).
+        """
+        convert = self._defaults.get(type(object_))
+        if convert is None:
+            convert = self._compile_default(type(object_))
+        return convert(object_)
+
+    def _compile_default(self, type_):
+        for base in (list, dict, str, int):  # subclasses, e.g. lazy lists
+            if issubclass(type_, base):
+                self._defaults[type_] = base
+                return base
+        if not issubclass(type_, self.types.Constructor):
+            error = "Object of type {0} is not JSON serializable"
+            raise TypeError(error.format(type_.__name__))
+        name = type_.__name__
+        kind, arg_types = type_._def[1]
+        data_type_def = type_.__mro__[2]._def
+        single_type_constructor = len(data_type_def[1][1]) == 1
+
+        if type_ is self.Pandoc:
+            api_version = json.loads(self._api_version)
+
+            def convert(object_):
+                meta, blocks = object_._args
+                return {
+                    "pandoc-api-version": api_version,
+                    "meta": meta._args[0],
+                    "blocks": blocks,
+                }
+
+        elif kind == "map":  # record
+            keys = [key for key, _ in arg_types]
+            if single_type_constructor:
+
+                def convert(object_):
+                    return dict(zip(keys, object_._args))
+
+            else:
+
+                def convert(object_):
+                    json_ = {"t": name}
+                    json_.update(zip(keys, object_._args))
+                    return json_
+
+        elif single_type_constructor:  # untagged
+            if len(arg_types) == 1:
+
+                def convert(object_):
+                    return object_._args[0]
+
+            else:
+
+                def convert(object_):
+                    return object_._args
+
+        elif len(arg_types) == 0:
+
+            def convert(object_):
+                return {"t": name}
+
+        elif len(arg_types) == 1:
+
+            def convert(object_):
+                return {"t": name, "c": object_._args[0]}
+
+        else:
+
+            def convert(object_):
+                return {"t": name, "c": object_._args}
+
+        if self._holds_floats(type_):  # orjson would write null for nan and inf
+            convert_ = convert
+
+            def convert(object_):
+                if not _finite(object_._args):
+                    raise ValueError("non-finite float")
+                return convert_(object_)
+
+        self._defaults[type_] = convert
+        return convert
+
+    def _holds_floats(self, type_):
+        "Return True if the arguments of the constructor `type_` hold floats."
+        floats = getattr(self, "_floats", None)
+        if floats is None:  # the names of the types that hold floats
+            floats = self._floats = {"Double"}
+            aliases = [
+                (name, repr(alias._def))
+                for name, alias in self.types._types_dict.items()
+                if isinstance(alias, type) and issubclass(alias, self.types.TypeDef)
+            ]
+            changed = True
+            while changed:
+                changed = False
+                for name, definition in aliases:
+                    if name not in floats and _mentions(definition, floats):
+                        floats.add(name)
+                        changed = True
+        return _mentions(repr(type_._def[1]), floats)
+
+    def dump(self, object_, write):
+        """
+        Write the JSON representation of `object_` as strings to `write`;
+        documents are written incrementally, every few blocks.
+        """
+        chunks = []
+        append = chunks.append
+        encode = self.encode
+        if type(object_) is self.Pandoc and isinstance(object_[1], list):
+            meta, blocks = object_._args
+            append(self._header)
+            encode(meta._args[0], append)
+            append(', "blocks": [')
+            for index, block in enumerate(blocks):
+                if index:
+                    append(", ")
+                encode(block, append)
+                if len(chunks) >= FLUSH_SIZE:
+                    write("".join(chunks))
+                    chunks.clear()
+            append("]}")
+        else:
+            encode(object_, append)
+        write("".join(chunks))
+
+
+_encoders = None
+
+
+def encoders(types, version):
+    "Return the (cached) encoders of the current pandoc types."
+    global _encoders
+    current = _encoders
+    if current is None or current.Pandoc is not types.Pandoc:
+        current = _encoders = Encoders(types, version)
+    return current
+
+
+# JSON Backends
+# ------------------------------------------------------------------------------
+
+# The standard library `json` module is always available; the faster
+# libraries are used when they are installed. A backend reads documents from
+# JSON text (bytes or str) and writes them to a `stream.Writer`. It also
+# handles the plain JSON values (of the pandoc-types < 1.17 documents).
+#
+# Nota: the documents are always written incrementally (a few blocks at a
+# time). orjson writes the non-finite floats (NaN and infinities) as null and
+# does not read them: the stdlib encoder and decoder are used instead for the
+# values that hold them.
+
+
+class JSONBackend:
+    name = "json"
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def read(self, decoders, data, type_=None):
+        return decoders.loads(data, type_)  # single-pass decoding
+
+    def dump_value(self, json_, writer):
+        writer.write(json.dumps(json_))
+
+    def dump(self, encoders, object_, writer):
+        encoders.dump(object_, writer.write)  # incremental, same as json.dumps
+
+
+class OrjsonBackend:
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self.orjson = orjson
+        self.options = orjson.OPT_NON_STR_KEYS
+
+    def loads(self, data):
+        try:
+            return self.orjson.loads(data)
+        except self.orjson.JSONDecodeError:  # e.g. NaN, Infinity
+            return json.loads(data)
+
+    def read(self, decoders, data, type_=None):
+        return decoders.get(type_)(self.loads(data))
+
+    def dump_value(self, json_, writer):
+        if _finite_value(json_):
+            writer.write_bytes(self.orjson.dumps(json_, option=self.options))
+        else:
+            writer.write(json.dumps(json_))
+
+    def dump(self, encoders, object_, writer):
+        orjson = self.orjson
+        # Nota: the subclasses of list (lazy lists) shall not be serialized
+        # from their storage, hence OPT_PASSTHROUGH_SUBCLASS.
+        options = self.options | orjson.OPT_PASSTHROUGH_SUBCLASS
+        default = encoders.default
+
+        def encode(value):
+            try:
+                return orjson.dumps(value, default=default, option=options)
+            except orjson.JSONEncodeError:  # e.g. non-finite floats, deep nesting
+                chunks = []
+                encoders.encode(value, chunks.append)
+                return "".join(chunks).encode("utf-8")
+
+        if type(object_) is encoders.Pandoc and isinstance(object_[1], list):
+            meta, blocks = object_._args
+            writer.write(encoders._header)
+            chunks = [encode(meta._args[0]), b', "blocks": [']
+            for index, block in enumerate(blocks):
+                if index:
+                    chunks.append(b", ")
+                chunks.append(encode(block))
+                if len(chunks) >= FLUSH_SIZE:
+                    writer.write_bytes(b"".join(chunks))
+                    chunks.clear()
+            chunks.append(b"]}")
+            writer.write_bytes(b"".join(chunks))
+        else:
+            writer.write_bytes(encode(object_))
+
+
+def _finite_value(json_):
+    "Return False if the JSON value holds a non-finite float."
+    if type(json_) is float:
+        return math.isfinite(json_)
+    elif isinstance(json_, (list, tuple)):
+        return all(_finite_value(item) for item in json_)
+    elif isinstance(json_, dict):
+        return all(_finite_value(item) for item in json_.values())
+    return True
+
+
+class AutoBackend(JSONBackend):
+    """
+    The fastest installed methods that give the same results as the json
+    module: the documents are read in a single pass and written incrementally
+    with the json module, the plain JSON values are read with orjson.
+    """
+
+    name = "auto"
+
+    def __init__(self):
+        try:
+            self.fast = OrjsonBackend()
+        except ImportError:
+            self.fast = JSONBackend()
+
+    def loads(self, data):
+        return self.fast.loads(data)
+
+
+BACKENDS = {"auto": AutoBackend, "orjson": OrjsonBackend, "json": JSONBackend}
+
+_backend = None
+
+
+def set_backend(name=None):
+    "Select a JSON backend by name ('auto' by default)."
+    global _backend
+    if name is None:
+        name = "auto"
+    if name not in BACKENDS:
+        error = "unknown JSON backend {0!r} (available: {1})"
+        raise ValueError(error.format(name, ", ".join(BACKENDS)))
+    _backend = BACKENDS[name]()  # ImportError if the library is not installed
+    return _backend
+
+
+def get_backend():
+    if _backend is None:
+        set_backend()
+    return _backend
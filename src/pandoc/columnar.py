@@ -0,0 +1,190 @@
+# coding: utf-8
+
+# Python 3 Standard Library
+import array
+
+# Pandoc
+from . import binary
+from .binary import NONE, FALSE, TRUE, INT, FLOAT, STRING, LIST, TUPLE, MAP
+from .binary import CONSTRUCTOR
+
+
+# Columns
+# ------------------------------------------------------------------------------
+
+# The columns of a pandoc object (e.g. a document) describe its nodes (the
+# elements, lists, tuples, dicts, strings, numbers, booleans and None) in
+# pre-order, as `pandoc.iter` (but the keys and values of dicts are their
+# children, not their items); the node 0 is the root. The columns are:
+#
+#   - "kind": the code of the type of the node (unsigned 16-bit integers);
+#     the type name of a code is found in "names" (e.g. "Str" or "list"),
+#
+#   - "parent": the index of the parent node, -1 for the root (signed 64-bit),
+#
+#   - "depth": the depth of the node, 0 for the root (unsigned 32-bit),
+#
+#   - "position": the index of the node among the children of its parent
+#     (unsigned 32-bit): the arguments of an element, the items of a list or
+#     tuple and the keys and values of a dict, alternately,
+#
+#   - "offsets": the text of the node i is text[offsets[i]:offsets[i + 1]]
+#     (unsigned 64-bit byte offsets); only strings and numbers (their repr)
+#     have a text,
+#
+#   - "text": the concatenated texts of the nodes, encoded in UTF-8 (bytes;
+#     the lone surrogates are kept with "surrogatepass", as in the binary
+#     format),
+#
+#   - "names": the type names of the codes (None for unused codes).
+#
+# The numeric columns are arrays (`array.array`), in the native byte order:
+# they support the buffer protocol, so NumPy wraps them without a copy (e.g.
+# `numpy.frombuffer(columns["parent"], dtype=numpy.int64)`), and so does the
+# text (e.g. `numpy.frombuffer(columns["text"], dtype=numpy.uint8)`).
+#
+# Nota: the codes are the ones of the binary format, which depend on the
+# version of pandoc-types; the reverse conversion finds the types by name.
+
+_names = {
+    NONE: "None",
+    FALSE: "False",
+    TRUE: "True",
+    INT: "int",
+    FLOAT: "float",
+    STRING: "str",
+    LIST: "list",
+    TUPLE: "tuple",
+    MAP: "dict",
+}
+_containers = {list: LIST, tuple: TUPLE, dict: MAP}
+
+
+def to_columns(object_, types):
+    "Return the columns of the nodes of `object_`."
+    codec = binary.codec(types)
+    tags = codec.tags
+    kind = array.array("H")
+    parent = array.array("q")
+    depth = array.array("I")
+    position = array.array("I")
+    offsets = array.array("Q", [0])
+    texts = []
+    size = 0
+
+    stack = [(object_, -1, 0, 0)]  # the nodes to visit, last one first
+    pop, push = stack.pop, stack.extend
+    while stack:
+        value, parent_index, level, index = pop()
+        type_ = type(value)
+        code = tags.get(type_)
+        children = None
+        if code is not None:
+            children = value._args
+        elif type_ is str:
+            code = STRING
+            text = value.encode("utf-8", "surrogatepass")
+            texts.append(text)
+            size += len(text)
+        elif type_ is list or type_ is tuple or type_ is dict:
+            code = _containers[type_]
+            children = value
+            if type_ is dict:
+                children = [item for pair in value.items() for item in pair]
+        elif value is None:
+            code = NONE
+        elif type_ is bool:
+            code = TRUE if value else FALSE
+        elif type_ is int or type_ is float:
+            code = INT if type_ is int else FLOAT
+            text = repr(value).encode("ascii")
+            texts.append(text)
+            size += len(text)
+        else:  # subclasses of the primitive types (e.g. lazy lists)
+            for base in (bool, int, float, str, list, tuple, dict):
+                if isinstance(value, base):
+                    stack.append((base(value), parent_index, level, index))
+                    break
+            else:
+                error = "Object of type {0} cannot be converted to columns"
+                raise TypeError(error.format(type_.__name__))
+            continue
+        node = len(kind)
+        kind.append(code)
+        parent.append(parent_index)
+        depth.append(level)
+        position.append(index)
+        offsets.append(size)
+        if children:
+            level += 1
+            count = len(children)
+            push(
+                (children[i], node, level, i) for i in range(count - 1, -1, -1)
+            )
+
+    names = [None] * CONSTRUCTOR
+    for code, name in _names.items():
+        names[code] = name
+    names += [type_.__name__ for type_ in codec.constructors]
+    return {
+        "kind": kind,
+        "parent": parent,
+        "depth": depth,
+        "position": position,
+        "offsets": offsets,
+        "text": b"".join(texts),
+        "names": names,
+    }
+
+
+def from_columns(columns, types):
+    "Return the pandoc object described by `columns` (see `to_columns`)."
+    kind, parent = columns["kind"], columns["parent"]
+    offsets, text, names = columns["offsets"], columns["text"], columns["names"]
+    count = len(kind)
+    if count == 0 or len(parent) != count or len(offsets) != count + 1:
+        raise ValueError("invalid columns (inconsistent lengths)")
+
+    constructors = [None] * len(names)
+    for code, name in enumerate(names):
+        if code >= CONSTRUCTOR:
+            constructors[code] = getattr(types, name, None)
+            if constructors[code] is None:
+                raise ValueError("unknown constructor {0!r}".format(name))
+    children = [0] * count  # the number of children of every node
+    for index in parent:
+        if index >= 0:
+            children[index] += 1
+
+    # The nodes are built from the last one: the children of a node are then
+    # on the top of the stack, the first child last.
+    stack = []
+    pop, push = stack.pop, stack.append
+    try:
+        for node in range(count - 1, -1, -1):
+            code = kind[node]
+            if code >= CONSTRUCTOR:
+                push(constructors[code](*[pop() for _ in range(children[node])]))
+            elif code == STRING:
+                data = text[offsets[node] : offsets[node + 1]]
+                push(str(data, "utf-8", "surrogatepass"))
+            elif code == LIST:
+                push([pop() for _ in range(children[node])])
+            elif code == TUPLE:
+                push(tuple([pop() for _ in range(children[node])]))
+            elif code == MAP:
+                items = [pop() for _ in range(children[node])]
+                push(dict(zip(items[::2], items[1::2])))
+            elif code == INT:
+                push(int(text[offsets[node] : offsets[node + 1]]))
+            elif code == FLOAT:
+                push(float(text[offsets[node] : offsets[node + 1]]))
+            elif code == NONE or code == FALSE or code == TRUE:
+                push(None if code == NONE else code == TRUE)
+            else:
+                raise ValueError("invalid columns (unknown code {0})".format(code))
+    except (IndexError, TypeError):  # missing children, wrong arity
+        raise ValueError("invalid columns (inconsistent parents)")
+    if len(stack) != 1:
+        raise ValueError("invalid columns (inconsistent parents)")
+    return stack[0]
@@ -0,0 +1,193 @@
+# coding: utf-8
+
+# Python 3 Standard Library
+import bisect
+import difflib
+
+
+# Edit Scripts
+# ------------------------------------------------------------------------------
+
+# An edit script is a list of operations, applied in order:
+#
+#   - ("insert", path, value): insert `value` at `path`,
+#
+#   - ("delete", path): delete the item at `path`,
+#
+#   - ("replace", path, value): replace the item at `path` with `value`,
+#
+#   - ("move", path, target): move the item at `path` to the path `target`
+#     in the same list (its index is the index after the removal of the item).
+#
+# A path is a tuple of indices (in elements and lists) and keys (in dicts);
+# the path of the root is (). Tuples (e.g. Attr), strings and numbers are
+# replaced as a whole.
+#
+# Nota: the lists are matched on the fingerprints (structural hashes) of their
+# items, computed bottom-up and cached in the elements during the diff: after
+# the removal of their common prefix and suffix, the matching blocks of
+# fingerprints are found by difflib. The remaining items with the same
+# fingerprint become moves, the other ones are paired when they are at the
+# same place (and then compared recursively) or deleted and inserted. Only
+# the items out of the longest increasing subsequence of the kept items are
+# moved.
+
+
+def diff(old, new, types):
+    "Return the edit script that changes `old` into `new`."
+    script = []
+    with types.cached_hashes():
+        types._structural_hash(old), types._structural_hash(new)
+        _diff(old, new, (), script, types)
+    return script
+
+
+def _diff(old, new, path, script, types):
+    if old is new:
+        return
+    if type(old) is type(new):
+        if isinstance(old, types.Constructor):
+            if old != new:
+                for index, (old_arg, new_arg) in enumerate(zip(old, new)):
+                    _diff(old_arg, new_arg, path + (index,), script, types)
+            return
+        elif isinstance(old, list):
+            return _diff_list(old, new, path, script, types)
+        elif isinstance(old, dict):
+            return _diff_dict(old, new, path, script, types)
+        elif old == new:
+            return
+    elif isinstance(old, list) and isinstance(new, list):  # e.g. lazy lists
+        return _diff_list(old, new, path, script, types)
+    script.append(("replace", path, new))
+
+
+def _diff_dict(old, new, path, script, types):
+    for key in old:
+        if key not in new:
+            script.append(("delete", path + (key,)))
+    for key, value in new.items():
+        if key in old:
+            _diff(old[key], value, path + (key,), script, types)
+        else:
+            script.append(("insert", path + (key,), value))
+
+
+def _diff_list(old, new, path, script, types):
+    fingerprint = types._structural_hash
+    a = [fingerprint(item) for item in old]
+    b = [fingerprint(item) for item in new]
+
+    # Match the items: source[j] is the index in `old` of the new item j
+    # (or None) and paired[j] is True if both items have to be compared.
+    source = [None] * len(b)
+    paired = [False] * len(b)
+    start, end = 0, 0
+    while start < min(len(a), len(b)) and a[start] == b[start]:
+        source[start] = start
+        start += 1
+    while end < min(len(a), len(b)) - start and a[-end - 1] == b[-end - 1]:
+        end += 1
+        source[-end] = len(a) - end
+    a_middle, b_middle = a[start : len(a) - end], b[start : len(b) - end]
+    matcher = difflib.SequenceMatcher(None, a_middle, b_middle, autojunk=False)
+    replaced = []
+    deleted = {}  # fingerprint -> old indices
+    inserted = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        i1, i2, j1, j2 = i1 + start, i2 + start, j1 + start, j2 + start
+        if tag == "equal":
+            source[j1:j2] = range(i1, i2)
+            continue
+        for i in range(i1, i2):
+            deleted.setdefault(a[i], []).append(i)
+        inserted.extend(range(j1, j2))
+        if tag == "replace":
+            replaced.append((i1, i2, j1, j2))
+    for j in inserted:  # moves
+        indices = deleted.get(b[j])
+        if indices:
+            source[j] = indices.pop(0)
+    matched = set(source)
+    for i1, i2, j1, j2 in replaced:  # pairs
+        old_indices = [i for i in range(i1, i2) if i not in matched]
+        new_indices = [j for j in range(j1, j2) if source[j] is None]
+        for i, j in zip(old_indices, new_indices):
+            source[j] = i
+            paired[j] = True
+    for j, i in enumerate(source):  # check the fingerprints
+        if i is not None and not paired[j]:
+            paired[j] = old[i] is not new[j] and old[i] != new[j]
+
+    # Generate the operations: deletions, moves, then insertions and changes.
+    kept = set(i for i in source if i is not None)
+    for i in reversed(range(len(old))):
+        if i not in kept:
+            script.append(("delete", path + (i,)))
+    order = [i for i in source if i is not None]  # kept items, new order
+    stay = set(_increasing_subsequence(order))
+    items = sorted(kept)  # current order of the kept items
+    for index, i in enumerate(order):
+        if i not in stay:
+            position = items.index(i)
+            del items[position]
+            target = items.index(order[index - 1]) + 1 if index else 0
+            items.insert(target, i)
+            script.append(("move", path + (position,), path + (target,)))
+    for j, i in enumerate(source):
+        if i is None:
+            script.append(("insert", path + (j,), new[j]))
+        elif paired[j]:
+            _diff(old[i], new[j], path + (j,), script, types)
+
+
+def _increasing_subsequence(numbers):
+    "Return a longest increasing subsequence of `numbers`."
+    tails = []  # smallest last number of the subsequences of each length
+    indices = []  # and its index
+    previous = [None] * len(numbers)
+    for index, number in enumerate(numbers):
+        length = bisect.bisect_left(tails, number)
+        if length:
+            previous[index] = indices[length - 1]
+        if length == len(tails):
+            tails.append(number)
+            indices.append(index)
+        else:
+            tails[length] = number
+            indices[length] = index
+    subsequence = []
+    index = indices[-1] if indices else None
+    while index is not None:
+        subsequence.append(numbers[index])
+        index = previous[index]
+    return subsequence[::-1]
+
+
+def patch(doc, script):
+    "Apply the edit script to `doc` (in place) and return the result."
+    for operation in script:
+        kind, path = operation[0], operation[1]
+        if kind not in ("insert", "delete", "replace", "move"):
+            raise ValueError("unknown operation {0!r}".format(kind))
+        if not path:
+            if kind != "replace":
+                raise ValueError("only the root can be replaced")
+            doc = operation[2]
+            continue
+        parent = doc
+        for key in path[:-1]:
+            parent = parent[key]
+        key = path[-1]
+        if kind == "replace":
+            parent[key] = operation[2]
+        elif kind == "delete":
+            del parent[key]
+        elif kind == "insert":
+            if isinstance(parent, dict):
+                parent[key] = operation[2]
+            else:
+                parent.insert(key, operation[2])
+        else:
+            parent.insert(operation[2][-1], parent.pop(key))
+    return doc
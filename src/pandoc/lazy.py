@@ -0,0 +1,235 @@
+# coding: utf-8
+
+# Python 3 Standard Library
+import functools
+import json
+import re
+
+# Lazy Lists
+# ------------------------------------------------------------------------------
+
+# Nota: a lazy list is a genuine list (`isinstance(blocks, list)` holds) whose
+# storage holds `Pending` wrappers of the sources (e.g. JSON texts) of the
+# items that have not been decoded yet. Every method that exposes the items
+# decodes them first and stores the result in place, so the list behaves
+# exactly like the decoded one.
+# The methods of `list` that read the storage directly (comparisons, repr,
+# search, copies, ...) decode the whole list first.
+
+
+class Pending:
+    "Source of an item that has not been decoded yet"
+
+    __slots__ = ["source"]
+
+    def __init__(self, source):
+        self.source = source
+
+
+class LazyList(list):
+    """
+    List whose items are decoded from their `sources` on first access with
+    `decode`; without `decode`, a plain list of the `sources`.
+    """
+
+    def __init__(self, sources=(), decode=None):
+        self._decode = decode
+        if decode is None:
+            list.__init__(self, sources)
+        else:
+            list.__init__(self, [Pending(source) for source in sources])
+
+    def _item(self, index):
+        item = list.__getitem__(self, index)
+        if type(item) is Pending:
+            item = self._decode(item.source)
+            list.__setitem__(self, index, item)
+        return item
+
+    def _materialize(self):
+        "Decode all the pending items."
+        if self._decode is not None:
+            for index, item in enumerate(list.__iter__(self)):
+                if type(item) is Pending:
+                    list.__setitem__(self, index, self._decode(item.source))
+            self._decode = None  # the new items are never pending
+        return self
+
+    def pending(self):
+        "Return the number of items that have not been decoded yet."
+        if self._decode is None:
+            return 0
+        return sum(1 for item in list.__iter__(self) if type(item) is Pending)
+
+    def __getitem__(self, key):
+        if self._decode is None:
+            return list.__getitem__(self, key)
+        if isinstance(key, slice):
+            for index in range(*key.indices(len(self))):
+                self._item(index)
+            return list.__getitem__(self, key)
+        return self._item(key)
+
+    def __iter__(self):
+        if self._decode is None:
+            return list.__iter__(self)
+        return self._iter()
+
+    def _iter(self):
+        index = 0
+        while index < len(self):  # same behavior as list iterators
+            yield self._item(index)
+            index += 1
+
+    def __reversed__(self):
+        return list.__reversed__(self._materialize())
+
+    def pop(self, index=-1):
+        self[index]
+        return list.pop(self, index)
+
+    def __radd__(self, other):  # list + lazy list
+        if not isinstance(other, list):
+            return NotImplemented
+        return list.__add__(other, self._materialize())
+
+    def __reduce_ex__(self, protocol):  # copies and pickles are decoded
+        return type(self), (list(self),)
+
+
+def _decoded(name):
+    method = getattr(list, name)
+
+    def decoded(self, *args, **kwargs):
+        for arg in args:
+            if isinstance(arg, LazyList):
+                arg._materialize()
+        return method(self._materialize(), *args, **kwargs)
+
+    decoded.__name__ = name
+    decoded.__doc__ = method.__doc__
+    return decoded
+
+
+for _name in [
+    "__eq__",
+    "__ne__",
+    "__lt__",
+    "__le__",
+    "__gt__",
+    "__ge__",
+    "__contains__",
+    "__repr__",
+    "__add__",
+    "__mul__",
+    "__rmul__",
+    "__imul__",
+    "copy",
+    "count",
+    "index",
+    "remove",
+    "sort",
+]:
+    setattr(LazyList, _name, _decoded(_name))
+del _name
+
+
+# Document Scanner
+# ------------------------------------------------------------------------------
+_whitespace = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def _skip(text, position, char=None):
+    "Skip the whitespace (and `char`) at `position` in `text`."
+    position = _whitespace.match(text, position).end()
+    if char is not None:
+        if text[position : position + 1] != char:
+            error = "expected {0!r}".format(char)
+            raise json.JSONDecodeError(error, text, position)
+        position = _whitespace.match(text, position + 1).end()
+    return position
+
+
+# Nota: the blocks are only delimited here, not parsed. A key "t" right after a
+# brace (`{"t"`) cannot be a part of a JSON string (it would have to end with
+# the brace and be followed by `t`), so it always starts an object. Hence the
+# first block object after the start of a block is either its next sibling,
+# preceded by `}` and `,` (the brace ends the block), or a nested block (the
+# first one of a list, after `[`), or the blocks end the array. Only in the
+# latter cases is the block parsed (with `raw_decode`) to find its end.
+
+
+@functools.lru_cache()
+def _block_start(names):
+    "Return the pattern of the start of a block object with one of `names`."
+    names = "|".join(re.escape(name) for name in names)
+    return re.compile(r'\{[ \t\n\r]*"t"[ \t\n\r]*:[ \t\n\r]*"(?:%s)"' % names)
+
+
+def _spans(text, position, names=()):
+    """
+    Return the slices of the items of the JSON array at `position` and its end;
+    the items that are objects of the constructors `names` are skipped faster.
+    """
+    spans = []
+    value = _decoder.raw_decode
+    search = _block_start(tuple(names)).search if names else None
+    position = _skip(text, position, "[")
+    if text[position : position + 1] == "]":
+        return spans, position + 1
+    while True:
+        match = search(text, position + 1) if search else None
+        if match:
+            start = match.start()
+            end = text.rfind("}", position, start) + 1
+            if end and text[end:start].strip() == ",":  # next sibling
+                spans.append(slice(position, end))
+                position = start
+                continue
+        _, end = value(text, position)
+        spans.append(slice(position, end))
+        position = _skip(text, end)
+        if text[position : position + 1] == ",":
+            position = _skip(text, position + 1)
+        else:
+            return spans, _skip(text, position, "]")
+
+
+def split_document(text, blocks=True, names=()):
+    """
+    Return the JSON value of the metadata of a pandoc JSON document and the
+    slices of `text` that hold its blocks; the constructors `names` of blocks
+    speed up the scan. Without `blocks`, the scan stops after the metadata
+    (and the slices are None).
+    """
+    value = _decoder.raw_decode
+    position = _skip(text, 0)
+    if text[position : position + 1] == "[":  # pandoc-types < 1.17
+        meta, position = value(text, _skip(text, position, "["))
+        if not blocks:
+            return meta, None
+        spans, _ = _spans(text, _skip(text, position, ","), names)
+        return meta, spans
+
+    meta = spans = None
+    position = _skip(text, position, "{")
+    while True:
+        key, position = value(text, position)
+        position = _skip(text, position, ":")
+        if key == "blocks":
+            spans, position = _spans(text, position, names)
+        else:
+            json_, position = value(text, position)
+            if key == "meta":
+                meta = json_
+                if not blocks:
+                    return meta, None
+        position = _skip(text, position)
+        if text[position : position + 1] != ",":
+            break
+        position = _skip(text, position + 1)
+    _skip(text, position, "}")
+    if meta is None or spans is None:
+        raise ValueError("no metadata or blocks found in the document")
+    return meta, spans
@@ -0,0 +1,172 @@
+# coding: utf-8
+
+# Python 3 Standard Library
+import re
+
+
+# Python Literal Parser
+# ------------------------------------------------------------------------------
+
+# Documents in the Python format are the representations (repr) of pandoc
+# objects: calls of the constructors of the pandoc types whose arguments are
+# lists, tuples, dicts, strings, numbers, booleans and None. They are parsed
+# in a single pass, with an explicit stack of the containers being built
+# (no recursion limit); nothing is evaluated, only the constructors of the
+# pandoc types can be called.
+
+_token = re.compile(
+    r"""
+    \s*(
+        [A-Za-z_][A-Za-z_0-9]*(?:\s*\()?  # constructor call or constant
+      | '(?:[^'\\\n]|\\.)*'
+      | "(?:[^"\\\n]|\\.)*"
+      | -?(?:\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?|inf)
+      | \S  # punctuation (or invalid character)
+    )
+    """,
+    re.VERBOSE,
+)
+_escape = re.compile(
+    r"\\(?:x([0-9a-fA-F]{2})|u([0-9a-fA-F]{4})|U([0-9a-fA-F]{8})|(.))"
+)
+_escapes = {
+    "\\": "\\",
+    "'": "'",
+    '"': '"',
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "a": "\a",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+}
+_constants = {
+    "True": True,
+    "False": False,
+    "None": None,
+    "inf": float("inf"),
+    "-inf": float("-inf"),
+    "nan": float("nan"),
+}
+_closing = {"call": ")", "[": "]", "(": ")", "{": "}"}
+
+
+def _unescape(match):
+    code = match.group(1) or match.group(2) or match.group(3)
+    if code is not None:
+        return chr(int(code, 16))
+    char = match.group(4)
+    if char not in _escapes:
+        raise ValueError("invalid escape sequence \\{0}".format(char))
+    return _escapes[char]
+
+
+def _error(text, index, message="invalid syntax"):
+    "Error at the token `index` of `text` (or at its end)."
+    position = len(text.rstrip())
+    for current, token in enumerate(_token.finditer(text)):
+        if current == index:
+            position = token.start(1)
+            break
+    line = text.count("\n", 0, position) + 1
+    column = position - text.rfind("\n", 0, position)
+    error = "{0} (line {1}, column {2})"
+    return ValueError(error.format(message, line, column))
+
+
+def parse(text, types):
+    "Build the pandoc object represented by `text` (Python syntax)."
+    constructors = {}
+    for name, type_ in vars(types).items():
+        if isinstance(type_, type) and issubclass(type_, types.Constructor):
+            if type_ is not types.Constructor:  # abstract
+                constructors[name] = type_
+    unescape = _escape.sub
+
+    # The stack holds the frames [opening, items, constructor, has_comma]
+    # of the enclosing containers; the top-level frame has no opening.
+    stack = []
+    opening, items, constructor, has_comma = None, [], None, False
+    after_value = False  # a value was just parsed (a separator is expected)
+    tokens = _token.findall(text)
+    for index, token in enumerate(tokens):
+        char = token[0]
+        if char == "," or char == ":":
+            if not after_value or opening is None:
+                raise _error(text, index)
+            if char == ",":
+                has_comma = True
+            elif opening != "{" or len(items) % 2 == 0:
+                raise _error(text, index)
+            after_value = False
+            continue
+        elif char == ")" or char == "]" or char == "}":
+            if opening is None or char != _closing[opening]:
+                raise _error(text, index)
+            if not after_value and items and not has_comma:
+                raise _error(text, index)
+            if opening == "call":
+                arity = len(constructor.__slots__)
+                if len(items) != arity:
+                    error = "{0} takes {1} argument(s) ({2} given)"
+                    name = constructor.__name__
+                    raise _error(text, index, error.format(name, arity, len(items)))
+                value = constructor(*items)
+            elif opening == "[":
+                value = items
+            elif opening == "(":
+                if len(items) == 1 and not has_comma:  # parenthesized value
+                    value = items[0]
+                else:
+                    value = tuple(items)
+            else:
+                if len(items) % 2:
+                    raise _error(text, index)
+                value = dict(zip(items[::2], items[1::2]))
+            opening, items, constructor, has_comma = stack.pop()
+        elif after_value:
+            raise _error(text, index)
+        elif token[-1] == "(":
+            stack.append([opening, items, constructor, has_comma])
+            if char == "(":
+                opening, constructor = "(", None
+            else:
+                name = token[:-1].rstrip()
+                constructor = constructors.get(name)
+                if constructor is None:
+                    message = "unknown constructor {0!r}".format(name)
+                    raise _error(text, index, message)
+                opening = "call"
+            items, has_comma = [], False
+            continue
+        elif char == "'" or char == '"':
+            value = token[1:-1]
+            if "\\" in value:
+                try:
+                    value = unescape(_unescape, value)
+                except ValueError as error:
+                    raise _error(text, index, str(error))
+        elif char == "[" or char == "{":
+            stack.append([opening, items, constructor, has_comma])
+            opening, items, constructor, has_comma = char, [], None, False
+            continue
+        elif token in _constants:
+            value = _constants[token]
+        elif char.isdigit() or char == "-" or char == ".":
+            if "." in token or "e" in token or "E" in token:
+                value = float(token)
+            else:
+                value = int(token)
+        else:
+            raise _error(text, index)
+        if opening is None and items:  # a single top-level value
+            raise _error(text, index)
+        items.append(value)
+        after_value = True
+
+    if opening is not None:
+        raise _error(text, len(tokens), "unexpected end of input")
+    if not items:
+        raise _error(text, len(tokens), "no value found")
+    return items[0]
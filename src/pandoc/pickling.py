@@ -0,0 +1,98 @@
+# coding: utf-8
+
+# Python 3 Standard Library
+import copyreg
+import io
+import operator
+
+# Pandoc
+import pandoc
+
+
+# Pickling
+# ------------------------------------------------------------------------------
+
+# Nota: the instances of the pandoc types are pickled as their type and their
+# arguments (see `Constructor.__reduce__`); the types themselves are pickled
+# by name, with the version of pandoc-types (see `load_type`), so that they
+# are never unpickled as the types of another version. The pickle module is
+# imported on first use (it is slow to import).
+#
+# Nota: the bulk pickler (`dumps`) does not call `__reduce__` (a Python call
+# for every node): its dispatch table maps every constructor to an attribute
+# getter (a C callable). The nullary constructors are pickled as their type
+# and `()` (calls, so that shared instances stay shared), the other ones as
+# `copyreg.__newobj__`, their type and a state: the value of their argument
+# (arity 1) or the tuple of their arguments, restored by `__setstate__` (made
+# for every arity, like `__init__`).
+
+
+def _import_types(version):
+    "Return the pandoc types of `version` (configured if needed)."
+    configuration = pandoc.configure(read=True)
+    if configuration is None:  # use the pandoc program if there is one
+        try:
+            pandoc.configure(auto=True, pandoc_types_version=version)
+        except RuntimeError:  # pandoc not found
+            pandoc.configure(pandoc_types_version=version)
+    elif configuration["pandoc_types_version"] != version:
+        error = "object pickled with pandoc-types {0}, not {1}"
+        current = configuration["pandoc_types_version"]
+        raise ValueError(error.format(version, current))
+    return pandoc.import_types()
+
+
+def load_type(version, name):
+    "Return the pandoc type `name` (pickled with pandoc-types `version`)."
+    return getattr(_import_types(version), name)
+
+
+_dispatch_table = None
+
+
+def _get_dispatch_table(types):
+    "Return the (cached) dispatch table of the bulk pickler."
+    global _dispatch_table
+    current = _dispatch_table
+    if current is None or current.get(types.Pandoc) is None:
+        current = _dispatch_table = {}
+        types.Constructor._newobj = copyreg.__newobj__
+        for type_ in types._types_dict.values():
+            if isinstance(type_, type) and issubclass(type_, types.Constructor):
+                arity = len(type_.__slots__)
+                if arity == 0:
+                    reduce = operator.attrgetter("__class__", "_args")
+                else:
+                    type_._newobj_args = (type_,)
+                    state = "_0" if arity == 1 else "_args"
+                    reduce = operator.attrgetter("_newobj", "_newobj_args", state)
+                current[type_] = reduce
+    return current
+
+
+def dumps(object_, protocol=None):
+    """
+    Pickle a pandoc object (e.g. a document): the version of pandoc-types is
+    stored once and the types are pickled by reference.
+    """
+    import pickle
+
+    if protocol is None:
+        protocol = pickle.HIGHEST_PROTOCOL
+    version = pandoc.configure(read=True)["pandoc_types_version"]
+    file = io.BytesIO()
+    pickle.dump(version, file, protocol)
+    pickler = pickle.Pickler(file, protocol)
+    # Nota: the types are pickled by name (the version is already known).
+    pickler.dispatch_table = _get_dispatch_table(pandoc.import_types())
+    pickler.dump(object_)
+    return file.getvalue()
+
+
+def loads(data):
+    "Unpickle a pandoc object pickled with `dumps`."
+    import pickle
+
+    file = io.BytesIO(data)
+    _import_types(pickle.load(file))
+    return pickle.load(file)
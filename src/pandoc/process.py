@@ -0,0 +1,309 @@
+# coding: utf-8
+
+# Python 3 Standard Library
+import collections
+import os
+import subprocess
+import threading
+import weakref
+
+# Nota: plumbum and asyncio are imported on first use (slow imports).
+
+
+# Pipes
+# ------------------------------------------------------------------------------
+def run(path, args, input):
+    """
+    Run pandoc with the arguments `args`, feed `input` to its standard input
+    and return its standard output (bytes). The input is either bytes or a
+    function that writes to a binary file.
+    """
+    import plumbum
+
+    pandoc = plumbum.machines.LocalCommand(path)
+    process = pandoc.popen(
+        args,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    stdout, stderr = _communicate(process, input)
+    _check(process, [path] + list(args), stdout, stderr)
+    return stdout
+
+
+def _communicate(process, input):
+    "Same as `process.communicate`, but `input` may be a function of stdin."
+    if not callable(input):
+        return process.communicate(input)
+
+    outputs = {}
+
+    def read(name, file):
+        outputs[name] = file.read()
+        file.close()
+
+    threads = [
+        threading.Thread(target=read, args=("stdout", process.stdout)),
+        threading.Thread(target=read, args=("stderr", process.stderr)),
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        input(process.stdin)
+    except BrokenPipeError:  # the process has exited; see its return code.
+        pass
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        for thread in threads:
+            thread.join()
+        process.wait()
+    return outputs["stdout"], outputs["stderr"]
+
+
+def _check(process, argv, stdout, stderr):
+    if process.returncode != 0:
+        from plumbum.commands.processes import ProcessExecutionError
+
+        raise ProcessExecutionError(
+            argv,
+            process.returncode,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
+
+
+# Asynchronous Pipes
+# ------------------------------------------------------------------------------
+_limit = os.cpu_count() or 1
+_resources = weakref.WeakKeyDictionary()  # event loop -> semaphore, executor
+
+# Nota: the pipes of the processes are not handled by the asyncio subprocesses;
+# cancelled while they connect their pipes, those wait forever for the exit of
+# the process (Python 3.11 to 3.13), which hangs `asyncio.run` when it cancels
+# the pending calls. Every event loop has its own threads instead, as many as
+# its processes, so that the calls never wait for a thread.
+
+
+def set_limit(size):
+    global _limit
+    if size < 1:
+        raise ValueError("the concurrency limit should be at least 1.")
+    _limit = size
+    _resources.clear()
+
+
+def get_limit():
+    return _limit
+
+
+def _loop_resources():
+    "Return the semaphore and the executor of the current event loop."
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    loop = asyncio.get_running_loop()
+    resources = _resources.get(loop)
+    if resources is None:
+        semaphore = asyncio.Semaphore(_limit)
+        executor = ThreadPoolExecutor(_limit, thread_name_prefix="pandoc")
+        resources = _resources[loop] = semaphore, executor
+    return resources
+
+
+async def arun(path, args, input, timeout=None):
+    """
+    Asynchronous version of `run`; at most `get_limit()` pandoc processes
+    run at the same time in a given event loop. The process is killed if
+    the call is cancelled or exceeds `timeout` (in seconds).
+    """
+    import asyncio
+
+    semaphore, executor = _loop_resources()
+    async with semaphore:
+        process = subprocess.Popen(
+            [path] + list(args),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        loop = asyncio.get_running_loop()
+        outputs = loop.run_in_executor(executor, _communicate, process, input)
+        try:
+            stdout, stderr = await asyncio.wait_for(asyncio.shield(outputs), timeout)
+        except BaseException:  # cancellation or timeout
+            process.kill()
+            try:
+                await outputs  # returns once the process is dead
+            except Exception:  # e.g. broken pipe
+                pass
+            raise
+    _check(process, [path] + list(args), stdout, stderr)
+    return stdout
+
+
+# Worker Pool
+# ------------------------------------------------------------------------------
+
+# The pandoc command-line tool converts a single document per process (the
+# `pandoc server` mode only exists since pandoc 2.18, beyond the versions that
+# we support). So our "workers" are pandoc processes which are spawned ahead
+# of time with their final arguments and wait for their input on stdin: the
+# startup of the Haskell runtime happens before the conversion is requested,
+# off the critical path. Every worker is used once and immediately replaced.
+#
+# Nota: the workers are prepared for a command line, in a working directory
+# and an environment (the ones that plumbum would use to run pandoc): they are
+# the key of the idle workers. At most `size` workers are idle, those of the
+# least recently used keys are killed first to make room for the other ones.
+# No worker is prepared for a key after a failed conversion.
+
+
+class Pool:
+    def __init__(self, size=4):
+        if size < 1:
+            raise ValueError("the pool size should be at least 1.")
+        self.size = size
+        self.stats = {"hits": 0, "misses": 0, "failures": 0}
+        self._idle = collections.OrderedDict()  # key -> [process], LRU first
+        self._lock = threading.Lock()
+
+    def _key(self, path, args):
+        import plumbum
+
+        env = tuple(sorted(plumbum.local.env.getdict().items()))
+        return path, tuple(args), str(plumbum.local.cwd), env
+
+    def _spawn(self, key):
+        path, args, cwd, env = key
+        return subprocess.Popen(
+            [path] + list(args),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            env=dict(env),
+        )
+
+    def _acquire(self, key):
+        with self._lock:
+            workers = self._idle.get(key)
+            if workers is None:
+                workers = self._idle[key] = []
+            self._idle.move_to_end(key)
+            while workers:
+                worker = workers.pop(0)  # the oldest one, most likely ready
+                if worker.poll() is None:
+                    self.stats["hits"] += 1
+                    return worker
+                self.stats["failures"] += 1
+            self.stats["misses"] += 1
+        return None
+
+    def _room(self, key):
+        """
+        Return the number of workers that may be added for `key` and the
+        workers of the other keys which are evicted to make room for them.
+        """
+        missing = self.size - len(self._idle[key])
+        idle = sum(len(workers) for workers in self._idle.values())
+        evicted = []
+        for other in list(self._idle):  # least recently used first
+            if other == key:
+                continue
+            workers = self._idle[other]
+            while workers and idle + missing > self.size:
+                evicted.append(workers.pop(0))
+                idle -= 1
+            if not workers:
+                del self._idle[other]
+        return max(min(missing, self.size - idle), 0), evicted
+
+    def _release(self, key, success=True):
+        with self._lock:
+            workers = self._idle.get(key)
+            if workers is None:
+                return
+            if not success:  # the command line fails, don't prepare workers
+                del self._idle[key]
+                missing, evicted = 0, workers
+            else:
+                missing, evicted = self._room(key)
+        spares = []
+        failures = 0
+        for _ in range(missing):
+            try:
+                spares.append(self._spawn(key))
+            except OSError:
+                failures = 1
+                break
+        with self._lock:
+            self.stats["failures"] += failures
+            workers = self._idle.get(key)
+            if workers is not None:
+                idle = sum(len(workers) for workers in self._idle.values())
+                room = max(min(self.size - len(workers), self.size - idle), 0)
+                workers.extend(spares[:room])
+                spares = spares[room:]
+        _kill(spares + evicted)
+
+    def run(self, path, args, input):
+        """
+        Same as `run`, but return `None` when no process can be started,
+        so that the caller may fall back to another conversion method.
+        """
+        key = self._key(path, args)
+        worker = self._acquire(key)
+        if worker is None:
+            try:
+                worker = self._spawn(key)
+            except OSError:
+                with self._lock:
+                    self.stats["failures"] += 1
+                    self._idle.pop(key, None)
+                return None
+        success = False
+        try:
+            stdout, stderr = _communicate(worker, input)
+            success = worker.returncode == 0
+        finally:
+            if not success:
+                with self._lock:
+                    self.stats["failures"] += 1
+            self._release(key, success)
+        _check(worker, [path] + list(args), stdout, stderr)
+        return stdout
+
+    def check(self):
+        "Discard the dead workers and start the missing ones."
+        with self._lock:
+            keys = list(self._idle)
+            for workers in self._idle.values():
+                alive = [worker for worker in workers if worker.poll() is None]
+                self.stats["failures"] += len(workers) - len(alive)
+                workers[:] = alive
+        for key in keys:
+            self._release(key)
+
+    def info(self):
+        with self._lock:
+            idle = sum(len(workers) for workers in self._idle.values())
+            info = {"size": self.size, "idle": idle}
+            info.update(self.stats)
+        return info
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, collections.OrderedDict()
+        for workers in idle.values():
+            _kill(workers)
+
+
+def _kill(workers):
+    for worker in workers:
+        if worker.poll() is None:
+            worker.kill()
+        worker.communicate()
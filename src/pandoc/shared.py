@@ -0,0 +1,76 @@
+# coding: utf-8
+
+# Python 3 Standard Library
+import sys
+
+
+# Shared Values
+# ------------------------------------------------------------------------------
+
+# Nota: when sharing is enabled (see `pandoc.configure(sharing=True)`), the
+# values that are repeated all over the documents are shared:
+#
+#   - the nullary constructors (e.g. Space, SoftBreak or LineBreak) are
+#     singletons: `Space()` always returns the same instance,
+#
+#   - the JSON decoders return the same `EMPTY_ATTR` for all the elements
+#     without identifier, classes and key-value pairs,
+#
+#   - the strings decoded from JSON (e.g. the text of `Str` or the classes)
+#     are interned.
+#
+# The shared values cannot be modified in place: the nullary constructors have
+# no arguments, strings and tuples are immutable and the lists of `EMPTY_ATTR`
+# are frozen (modifying them raises a TypeError). Replace them instead, e.g.
+# `header[1] = ("intro", [], [])`.
+
+_enabled = False
+_instances = {}  # nullary constructor -> shared instance
+
+
+class FrozenList(list):
+    "List that cannot be modified in place"
+
+    __slots__ = ()
+
+    def _frozen(self, *args, **kwargs):
+        raise TypeError("shared list cannot be modified (replace it instead)")
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _frozen
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _frozen
+
+
+EMPTY_ATTR = ("", FrozenList(), FrozenList())
+
+
+def enabled():
+    "Return True when sharing is enabled."
+    return _enabled
+
+
+def enable(enabled=True):
+    "Enable (or disable) sharing, for the current and future pandoc types."
+    global _enabled
+    _enabled = bool(enabled)
+    types = sys.modules.get("pandoc.types")
+    if types is not None and "Pandoc" in types._types_dict:
+        install(types)
+
+
+def _new(cls):
+    instance = _instances.get(cls)
+    if instance is None:
+        instance = _instances[cls] = object.__new__(cls)
+    return instance
+
+
+def install(types):
+    "Share (or not, when sharing is disabled) the nullary constructors of `types`."
+    _instances.clear()
+    for type_ in types._types_dict.values():
+        if isinstance(type_, type) and issubclass(type_, types.Constructor):
+            if len(type_.__slots__) == 0:
+                if _enabled:
+                    type_.__new__ = staticmethod(_new)
+                elif "__new__" in vars(type_):
+                    del type_.__new__
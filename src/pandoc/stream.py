@@ -0,0 +1,176 @@
+# coding: utf-8
+
+# Python 3 Standard Library
+import codecs
+import io
+import json
+import re
+
+
+# Incremental JSON Scanner
+# ------------------------------------------------------------------------------
+
+# We only need to walk incrementally the top-level structure of the pandoc
+# JSON documents, that is
+#
+#     {"pandoc-api-version": [...], "meta": {...}, "blocks": [...]}
+#
+# (or [{"unMeta": {...}}, [...]] before pandoc-types 1.17). The values nested
+# inside (the metadata and every block) are decoded at once by the standard
+# JSON decoder, so the memory is bounded by the size of the largest of them.
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class Scanner:
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+
+    def _fill(self, size=None):
+        "Read more data; return False at the end of the file."
+        if self.eof:
+            return False
+        chunk = self.file.read(max(size or 0, self.chunk_size))
+        self.eof = len(chunk) == 0
+        if isinstance(chunk, bytes):
+            chunk = self._utf8.decode(chunk, final=self.eof)
+        if self.pos > 0:  # drop the data that has been consumed
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+        self.buffer += chunk
+        return not self.eof
+
+    def peek(self):
+        "Skip the whitespace and return the next character ('' at the end)."
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars):
+        char = self.peek()
+        if char == "" or char not in chars:
+            error = "expected one of {0!r} at offset {1}, found {2!r}"
+            raise ValueError(error.format(chars, self.pos, char))
+        self.pos += 1
+        return char
+
+    def value(self):
+        "Decode the next JSON value."
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value may be incomplete: read (at least) as much again.
+                if not self._fill(len(self.buffer) - self.pos):
+                    raise
+            else:
+                # A number may be split across two chunks.
+                if end == len(self.buffer) and not self.eof:
+                    if self._fill():
+                        continue
+                self.pos = end
+                return value
+
+    def items(self):
+        "Iterate over the elements of a JSON array."
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+    def members(self):
+        "Iterate over the keys of a JSON object; the values must be consumed."
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+
+def iter_document(file, chunk_size=CHUNK_SIZE):
+    """
+    Iterate over the parts of a pandoc JSON document: yield `("meta", json_)`
+    first, then `("block", json_)` for every block.
+    """
+    scanner = Scanner(file, chunk_size)
+    if scanner.peek() == "[":  # pandoc-types < 1.17
+        scanner.expect("[")
+        yield "meta", scanner.value()
+        scanner.expect(",")
+        for block in scanner.items():
+            yield "block", block
+        scanner.expect("]")
+        return
+
+    meta = None
+    blocks = None  # blocks that appear before the metadata
+    for key in scanner.members():
+        if key == "meta":
+            meta = scanner.value()
+            yield "meta", meta
+            for block in blocks or []:
+                yield "block", block
+            blocks = None
+        elif key == "blocks":
+            if meta is not None:
+                for block in scanner.items():
+                    yield "block", block
+            else:
+                blocks = list(scanner.items())
+        else:
+            scanner.value()
+    if meta is None:
+        raise ValueError("no metadata found in the document")
+
+
+# Buffered Writer
+# ------------------------------------------------------------------------------
+class Writer:
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.text = isinstance(file, io.TextIOBase)
+        self._chunks = []
+        self._size = 0
+
+    def write(self, string):
+        self._chunks.append(string)
+        self._size += len(string)
+        if self._size >= self.chunk_size:
+            self.flush()
+
+    def write_bytes(self, data):
+        "Write UTF-8 encoded data."
+        self.flush()
+        if self.text:
+            data = data.decode("utf-8")
+        self.file.write(data)
+
+    def flush(self):
+        data = "".join(self._chunks)
+        self._chunks = []
+        self._size = 0
+        if data:
+            if not self.text:
+                data = data.encode("utf-8")
+            self.file.write(data)
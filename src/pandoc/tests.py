@@ -4,15 +4,17 @@ from __future__ import absolute_import
 # Python 2.7 Standard Library
 import pandoc.doctest
 import doctest
+import importlib.resources
 import unittest
 import sys
 import tempfile
 
-# Third-Party Libraries
-import pkg_resources
 
-
-path = pkg_resources.resource_filename("pandoc", "tests.md")
+try:
+    path = str(importlib.resources.files("pandoc").joinpath("tests.md"))
+except AttributeError:  # Python < 3.9
+    with importlib.resources.path("pandoc", "tests.md") as path:
+        path = str(path)
 suite = doctest.DocFileSuite(path, module_relative=False)
 
 
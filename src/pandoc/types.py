@@ -3,15 +3,17 @@
 # Python 3 Standard Library
 import builtins
 import collections
+import contextlib
+import copyreg
 import inspect
+import operator
 import pydoc
 import sys
 
-# Third-Party Libraries
-import pkg_resources
-
 # Pandoc
 import pandoc
+import pandoc.caching
+import pandoc.shared
 import pandoc.utils
 
 
@@ -32,34 +34,121 @@ class MetaType(type):
             return type.__repr__(cls)
 
 
-Type = MetaType("Type", (object,), {"__init__": _fail_init})
+Type = MetaType("Type", (object,), {"__init__": _fail_init, "__slots__": ()})
 
 
 class Data(Type):
-    pass
+    __slots__ = ()
+
+
+# Nota: the instances of the constructors have no `__dict__`; their arguments
+# are stored in the slots `_0`, `_1`, ... of their class (the arity of the
+# constructors is fixed) and `_args` is the tuple of their values.
+#
+# Nota: the hash of an instance is structural (equal instances have equal
+# hashes): it is computed bottom-up from its type and arguments (the lists
+# and dicts are hashed by their content). Since the lists of an instance can
+# be changed in place (which is not tracked), a hash is only cached in the
+# instance within a `cached_hashes` block, with the generation of the block;
+# outside of these blocks, the hashes are computed again every time (like
+# the hashes of tuples), and each computation caches the hashes of the shared
+# subtrees. An assignment `elt[i] = value` invalidates the hash of `elt`.
+
+_generation = 0  # of the current (or last) cached_hashes block
+_caching = 0  # number of nested cached_hashes blocks
+
+
+@contextlib.contextmanager
+def cached_hashes():
+    """
+    Cache the hashes of the instances within the block (which is faster when
+    the same elements are hashed or compared many times); the instances must
+    not be modified in the block.
+    """
+    global _generation, _caching
+    if not _caching:
+        _generation += 1
+    _caching += 1
+    try:
+        yield
+    finally:
+        _caching -= 1
+
+
+_containers = (list, tuple, dict)  # and their subclasses, e.g. lazy lists
+
+
+def _structural_hash(value):
+    "Structural hash of an argument of a constructor"
+    if isinstance(value, dict):
+        return hash(frozenset([(k, _structural_hash(v)) for k, v in value.items()]))
+    elif isinstance(value, (list, tuple)):
+        hashes = [
+            _structural_hash(item) if isinstance(item, _containers) else hash(item)
+            for item in value
+        ]
+        return hash(tuple(hashes))
+    else:
+        return hash(value)
 
 
 class Constructor(Data):
+    __slots__ = ("_hash", "_hash_generation")
+
     def __init__(self, *args):
-        if type(self) is Constructor:
-            _fail_init(self, *args)
-        else:
-            self._args = list(args)
+        _fail_init(self, *args)
 
     def __iter__(self):
         return iter(self._args)
 
     def __getitem__(self, key):
+        if isinstance(key, slice):
+            return list(self._args[key])
         return self._args[key]
 
     def __setitem__(self, key, value):
-        self._args[key] = value
+        self._hash_generation = -1
+        if isinstance(key, slice):
+            args = list(self._args)
+            args[key] = value
+            if len(args) != len(self.__slots__):
+                error = "cannot change the number of arguments of {0}"
+                raise ValueError(error.format(type(self).__name__))
+            for name, arg in zip(self.__slots__, args):
+                setattr(self, name, arg)
+        else:
+            setattr(self, self.__slots__[key], value)
 
     def __len__(self):
-        return len(self._args)
+        return len(self.__slots__)
+
+    def __hash__(self):
+        if _caching == 0:
+            with cached_hashes():
+                return self.__hash__()
+        if self._hash_generation == _generation:
+            return self._hash
+        hashes = [
+            _structural_hash(arg) if isinstance(arg, _containers) else hash(arg)
+            for arg in self._args
+        ]
+        value = hash((type(self), *hashes))
+        self._hash = value
+        self._hash_generation = _generation
+        return value
 
     def __eq__(self, other):
-        return type(self) == type(other) and self[:] == other[:]
+        if self is other:
+            return True
+        if type(self) is not type(other):
+            return False
+        if (  # the hashes are compared when they are both known (and fresh)
+            self._hash_generation == _generation == other._hash_generation
+            and _caching
+            and self._hash != other._hash
+        ):
+            return False
+        return self._args == other._args
 
     def __neq__(self, other):
         return not (self == other)
@@ -71,9 +160,57 @@ class Constructor(Data):
 
     __str__ = __repr__
 
+    def __reduce__(self):  # pickled as the type and the arguments
+        return type(self), self._args
+
+
+_constructor_members = {}
+
+
+def _slots(arity):
+    """
+    Return the slots, `__init__`, `__setstate__` (see `pandoc.pickling.dumps`)
+    and `_args` of the constructors of `arity`.
+    """
+    members = _constructor_members.get(arity)
+    if members is None:
+        slots = tuple("_{0}".format(i) for i in range(arity))
+        source = "def __init__(self{0}):\n".format("".join(", " + s for s in slots))
+        source += "".join("    self.{0} = {0}\n".format(s) for s in slots)
+        source += "    self._hash_generation = -1\n"  # never hashed
+        if arity:  # the state is the argument (arity 1) or the arguments
+            source += "def __setstate__(self, state):\n"
+            source += "    self.{0} = state\n".format(", self.".join(slots))
+            source += "    self._hash_generation = -1\n"
+        namespace = {}
+        exec(source, namespace)
+        if arity == 0:
+            args = ()
+        elif arity == 1:
+            args = property(lambda self: (self._0,))
+        else:
+            args = property(operator.attrgetter(*slots))
+        members = _constructor_members[arity] = {
+            "__slots__": slots,
+            "__init__": namespace["__init__"],
+            "_args": args,
+        }
+        if arity:
+            members["__setstate__"] = namespace["__setstate__"]
+    return members
+
 
 class TypeDef(Type):
-    pass
+    __slots__ = ()
+
+
+def _reduce_type(cls):
+    "Pickle the pandoc types by name, with the version of pandoc-types."
+    version = pandoc._configuration["pandoc_types_version"]
+    return pandoc.pickling.load_type, (version, cls.__name__)
+
+
+copyreg.pickle(MetaType, _reduce_type)
 
 
 # Pandoc Types
@@ -158,13 +295,23 @@ def make_types():
     # Nota: experiments show that Maybe Stuff is serialiazed in JSON as
     # `null` or an instance of stuff. I guess that's how it is since I
     # don't see a support for it in the markdown reader doc (yet ?).
-    defs = pandoc.utils.parse(defs_src)
+    definitions = pandoc.caching.get_definitions(defs_src)
+    if definitions is None:
+        definitions = []
+        for decl in pandoc.utils.parse(defs_src):
+            if decl[0] in ("data", "newtype"):
+                constructors = decl[1][1]
+            else:
+                constructors = []
+            docstrings = [pandoc.utils.docstring(c) for c in constructors]
+            definitions.append([decl, pandoc.utils.docstring(decl), docstrings])
+        pandoc.caching.set_definitions(defs_src, definitions)
 
     # Create the types
-    for decl in defs:
+    for decl, docstring, constructor_docstrings in definitions:
         decl_type = decl[0]
         type_name = decl[1][0]
-        _dict = {"_def": decl, "__doc__": pandoc.utils.docstring(decl)}
+        _dict = {"_def": decl, "__doc__": docstring, "__slots__": ()}
         if decl_type in ("data", "newtype"):
             data_type = type(type_name, (Data,), _dict)
             _types_dict[type_name] = data_type
@@ -173,13 +320,17 @@ def make_types():
             #         This is intentional, but it's only consistent because
             #         it happens when there is a single constructor.
             # TODO: add an assert / check for this condition.
-            for constructor in decl[1][1]:
+            constructors = decl[1][1]
+            for constructor, constructor_docstring in zip(
+                constructors, constructor_docstrings
+            ):
                 constructor_name = constructor[0]
                 bases = (Constructor, data_type)
                 _dict = {
                     "_def": constructor,
-                    "__doc__": pandoc.utils.docstring(constructor),
+                    "__doc__": constructor_docstring,
                 }
+                _dict.update(_slots(len(constructor[1][1])))
                 type_ = type(constructor_name, bases, _dict)
                 _types_dict[constructor_name] = type_
         elif decl_type == "type":
@@ -188,6 +339,7 @@ def make_types():
 
     # Install the types
     globs.update(_types_dict)
+    pandoc.shared.install(sys.modules[__name__])
 
 
 # Create Types
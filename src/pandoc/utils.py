@@ -1,20 +1,19 @@
 # Python 2.7 Standard Library
 from __future__ import absolute_import
 from __future__ import print_function
+import importlib.resources
 import json
-
-# Third-Party Libraries
-import pkg_resources
-import ply.lex as lex
-import ply.yacc as yacc
+import sys
 
 
 # Pandoc-Types Version Mapping and Type Info
 # ------------------------------------------------------------------------------
-_json_data = pkg_resources.resource_string("pandoc", "pandoc-types.js")
-if not isinstance(_json_data, str):  # resource loaded as bytes in Python 3
-    _json_data = _json_data.decode("utf-8")
-_data = json.loads(_json_data)
+try:
+    _resource = importlib.resources.files("pandoc").joinpath("pandoc-types.js")
+    _text = _resource.read_text(encoding="utf-8")
+except AttributeError:  # Python < 3.9
+    _text = importlib.resources.read_text("pandoc", "pandoc-types.js")
+_data = json.loads(_text)
 version_mapping = _data["version_mapping"]
 definitions = _data["definitions"]
 
@@ -122,8 +121,6 @@ def t_error(t):
     t.lexer.skip(1)
 
 
-lexer = lex.lex()
-
 # Parser
 # ------------------------------------------------------------------------------
 def p_typedecl(p):
@@ -253,7 +250,20 @@ def p_error(p):
     print("Syntax error in input.")
 
 
-parser = yacc.yacc(debug=0, write_tables=0)
+# The lexer and parser are only built when they are needed: the parsed type
+# definitions are usually loaded from the cache (see `pandoc.caching`).
+_lexer = None
+_parser = None
+
+
+def _make_parser():
+    global _lexer, _parser
+    import ply.lex as lex
+    import ply.yacc as yacc
+
+    module = sys.modules[__name__]
+    _lexer = lex.lex(module=module)
+    _parser = yacc.yacc(module=module, debug=0, write_tables=0)
 
 
 # Type Declarations
@@ -276,7 +286,9 @@ def split(src):
 def parse(src):
     if not isinstance(src, str):  # unicode in Python 2
         src = str(src)
-    return [parser.parse(type_decl) for type_decl in split(src)]
+    if _parser is None:
+        _make_parser()
+    return [_parser.parse(type_decl, lexer=_lexer) for type_decl in split(src)]
 
 
 def docstring(decl):
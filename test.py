@@ -3,6 +3,7 @@
 # Python Standard Library
 import doctest
 import platform
+import subprocess
 import sys
 import re
 
@@ -37,6 +38,46 @@ for filename in test_files:
     fails += _fails
     tests += _tests
 
+# Import Time Budget
+# ------------------------------------------------------------------------------
+# `import pandoc` should not load the heavy dependencies, which are only needed
+# when pandoc is actually run, and should fit in a (generous) time budget.
+IMPORT_TIME_BUDGET = 0.1  # seconds
+HEAVY_MODULES = [
+    "plumbum",
+    "pkg_resources",
+    "ply",
+    "asyncio",
+    "argparse",
+    "concurrent.futures",
+]
+
+def import_time():
+    "Best cumulative import time of pandoc (in seconds) over a few runs"
+    times = []
+    for _ in range(3):
+        command = [sys.executable, "-X", "importtime", "-c", "import pandoc"]
+        output = subprocess.run(command, stderr=subprocess.PIPE, check=True)
+        modules = {}
+        for line in output.stderr.decode("utf-8").splitlines()[1:]:
+            _, cumulative, name = line.split("|")
+            modules[name.strip()] = int(cumulative) / 1e6
+        times.append(modules["pandoc"])
+    return min(times), set(modules)
+
+time_, modules = import_time()
+heavy = [name for name in HEAVY_MODULES if name in modules]
+tests += 1
+if time_ > IMPORT_TIME_BUDGET or heavy:
+    fails += 1
+    print(60*"*")
+    print("import pandoc: {0:.1f} ms".format(1000 * time_), end=" ")
+    print("(budget: {0:.1f} ms)".format(1000 * IMPORT_TIME_BUDGET))
+    if heavy:
+        print("heavy modules imported: " + ", ".join(heavy))
+elif verbose:
+    print("import pandoc: {0:.1f} ms".format(1000 * time_))
+
 if fails > 0 or verbose:
    print()
    print(60*"-")